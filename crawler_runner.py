@@ -0,0 +1,127 @@
+# In-process Scrapy runner for the monitor
+# Keeps one Twisted reactor and the loaded spider modules alive across cycles,
+# instead of starting a new `python -m scrapy crawl` subprocess per spider.
+
+import os
+import sys
+import time
+import threading
+import subprocess
+from types import SimpleNamespace
+
+
+class InProcessCrawlerRunner:
+    """Run spiders through Scrapy's CrawlerRunner on a long-lived reactor thread"""
+
+    def __init__(self, scrapy_project_path, cleanup_callback=None):
+        self.scrapy_project_path = scrapy_project_path
+        self.cleanup_callback = cleanup_callback
+        self.settings = None
+        self.runner = None
+        self.reactor = None
+        self.reactor_thread = None
+
+    def start(self):
+        """Install the reactor once and start it in a background thread"""
+        if self.runner is not None:
+            return
+
+        if self.scrapy_project_path not in sys.path:
+            sys.path.insert(0, self.scrapy_project_path)
+        os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'news_scraper.settings')
+
+        from scrapy.utils.project import get_project_settings
+        from scrapy.utils.reactor import install_reactor
+        from scrapy.utils.log import configure_logging
+
+        self.settings = get_project_settings()
+        install_reactor(self.settings['TWISTED_REACTOR'])
+
+        from twisted.internet import reactor
+        from scrapy.crawler import CrawlerRunner
+
+        configure_logging(self.settings)
+        self.runner = CrawlerRunner(self.settings)
+        self.reactor = reactor
+
+        # Signal handlers can only be installed from the main thread
+        self.reactor_thread = threading.Thread(
+            target=reactor.run,
+            kwargs={'installSignalHandlers': False},
+            name='scrapy-reactor',
+            daemon=True
+        )
+        self.reactor_thread.start()
+        print(f"⚙️ In-process Scrapy runner սկսված է ({self.settings['TWISTED_REACTOR']})")
+
+    def crawl(self, spider_name, timeout=120, grace=30):
+        """Schedule one crawl on the shared reactor and wait for it to finish
+
+        The spider gets `timeout` as its deadline and winds down by itself
+        (see news_scraper/deadline.py); it is stopped only if it is still
+        running `grace` seconds after that.
+
+        Returns an object shaped like subprocess.CompletedProcess so main()
+        can handle both runner modes the same way. Raises
+        subprocess.TimeoutExpired when the spider exceeds its timeout.
+        """
+        self.start()
+
+        done = threading.Event()
+        deadline = time.time() + timeout
+        state = {'crawler': None, 'error': None}
+
+        def _failed(failure):
+            state['error'] = failure.getErrorMessage()
+            return None
+
+        def _schedule():
+            try:
+                crawler = self.runner.create_crawler(spider_name)
+                state['crawler'] = crawler
+                deferred = self.runner.crawl(crawler, deadline=deadline)
+                deferred.addErrback(_failed)
+                deferred.addBoth(lambda _: done.set())
+            except Exception as e:
+                state['error'] = str(e)
+                done.set()
+
+        try:
+            self.reactor.callFromThread(_schedule)
+            finished = done.wait(timeout + grace)
+
+            if not finished:
+                # Ask the engine to close the spider, so pipelines and closed() still run
+                crawler = state['crawler']
+                if crawler is not None:
+                    self.reactor.callFromThread(crawler.stop)
+                done.wait(30)
+                raise subprocess.TimeoutExpired(cmd=spider_name, timeout=timeout + grace)
+        finally:
+            # Memory cleanup after spider finishes
+            if self.cleanup_callback:
+                memory_usage = self.cleanup_callback()
+                print(f"🧹 Spider {spider_name} finished, memory usage: {memory_usage:.1f} MB")
+
+        from news_scraper.run_stats import SUMMARY_STATS_KEY
+
+        # The JSON run summary is kept in the crawler's stats (see news_scraper/run_stats.py)
+        summary = None
+        if state['crawler'] is not None:
+            summary = state['crawler'].stats.get_value(SUMMARY_STATS_KEY)
+
+        result = SimpleNamespace()
+        result.returncode = 1 if state['error'] else 0
+        result.stdout = ''
+        result.stderr = state['error'] or ''
+        result.stats = [summary] if summary else []
+
+        if result.returncode != 0:
+            print(f"❌ Spider {spider_name} failed: {result.stderr}")
+
+        return result
+
+    def stop(self):
+        """Stop the shared reactor (called once when the monitor exits)"""
+        if self.reactor is not None and self.reactor.running:
+            self.reactor.callFromThread(self.reactor.stop)
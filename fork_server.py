@@ -0,0 +1,335 @@
+# Fork server (zygote) for spider runs
+#
+# A long-lived helper process imports Scrapy, Twisted, Selenium, redis and the
+# news_scraper spiders once, then forks a fresh child for every crawl. Each
+# crawl keeps the crash and memory isolation of a separate process, but skips
+# interpreter startup and module imports.
+#
+# Benchmark cold spawn against the fork server:
+#
+#     python fork_server.py --benchmark 5
+
+import os
+import sys
+import gc
+import json
+import time
+import signal
+import select
+import socket
+import threading
+import importlib
+import subprocess
+import traceback
+
+# Modules the zygote loads once; children inherit them already imported
+WARM_IMPORTS = [
+    'scrapy',
+    'scrapy.crawler',
+    'scrapy.spiderloader',
+    'scrapy.utils.project',
+    'twisted',
+    'selenium.webdriver',
+    'redis',
+    'psutil',
+    'requests',
+    'news_scraper.items',
+    'news_scraper.pipelines',
+    'news_scraper.run_stats',
+]
+
+MESSAGE_SIZE = 65536
+
+
+def _send(sock, message, fds=None):
+    data = json.dumps(message).encode('utf-8')
+    if fds:
+        socket.send_fds(sock, [data], fds)
+    else:
+        sock.send(data)
+
+
+# --- Zygote side -------------------------------------------------------------
+
+def warm_up():
+    """Import everything a crawl needs, including every spider module"""
+    started = time.time()
+    for module_name in WARM_IMPORTS:
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            print(f"⚠️ Fork server: {module_name} import սխալ: {e}")
+
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+    SpiderLoader.from_settings(get_project_settings())
+
+    # The reactor must be installed by each child, from TWISTED_REACTOR
+    if 'twisted.internet.reactor' in sys.modules:
+        print("⚠️ Fork server: reactor-ը արդեն տեղադրված է warm-up-ի ժամանակ")
+
+    # Keep the warm heap out of GC passes so children don't copy it on write
+    gc.collect()
+    gc.freeze()
+    return time.time() - started
+
+
+def _run_child(request, output_fd, stats_fd):
+    """Body of a forked child: run one crawl and exit, never returns"""
+    exit_code = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(output_fd, 1)
+        os.dup2(output_fd, 2)
+        os.close(output_fd)
+        os.environ['SPIDER_STATS_FD'] = str(stats_fd)
+
+        if request.get('probe'):
+            # Benchmark probe: everything is already imported
+            exit_code = 0
+        else:
+            from scrapy.crawler import CrawlerProcess
+            from scrapy.utils.project import get_project_settings
+
+            process = CrawlerProcess(get_project_settings())
+            spider_kwargs = {'deadline': request['deadline']} if request.get('deadline') else {}
+            process.crawl(request['spider'], **spider_kwargs)
+            process.start()
+            exit_code = 1 if process.bootstrap_failed else 0
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(exit_code)
+
+
+def serve(control_fd):
+    """Zygote loop: fork a child per request and report its exit code"""
+    control = socket.socket(fileno=control_fd)
+    warmup_seconds = warm_up()
+    _send(control, {'ready': True, 'pid': os.getpid(), 'warmup_seconds': round(warmup_seconds, 3)})
+
+    # SIGCHLD wakes the select loop so exit codes are reported without polling delay
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+    children = {}  # pid -> reply socket
+    try:
+        while True:
+            readable, _, _ = select.select([control, wakeup_read], [], [], 5)
+            if wakeup_read in readable:
+                os.read(wakeup_read, 512)
+            if control in readable:
+                data, fds, _, _ = socket.recv_fds(control, MESSAGE_SIZE, 3)
+                if not data:
+                    break  # monitor went away
+
+                request = json.loads(data)
+                output_fd, stats_fd, reply_fd = fds
+                reply = socket.socket(fileno=reply_fd)
+
+                pid = os.fork()
+                if pid == 0:
+                    signal.set_wakeup_fd(-1)
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    os.close(wakeup_read)
+                    os.close(wakeup_write)
+                    control.close()
+                    reply.close()
+                    for other in children.values():
+                        other.close()
+                    _run_child(request, output_fd, stats_fd)
+
+                os.close(output_fd)
+                os.close(stats_fd)
+                children[pid] = reply
+                _send(reply, {'pid': pid})
+
+            # Reap finished children and report their exit codes
+            while children:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                reply = children.pop(pid, None)
+                if reply is not None:
+                    try:
+                        _send(reply, {'returncode': os.waitstatus_to_exitcode(status)})
+                    except OSError:
+                        pass
+                    reply.close()
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+
+# --- Monitor side ------------------------------------------------------------
+
+class ForkedCrawl:
+    """Popen-like handle for a crawl forked by the fork server"""
+
+    def __init__(self, pid, output_fd, reply):
+        self.pid = pid
+        self.stdout = os.fdopen(output_fd, 'r', encoding='utf-8', errors='replace')
+        self.reply = reply
+        self.returncode = None
+
+    def wait(self, timeout=None):
+        if self.returncode is not None:
+            return self.returncode
+        self.reply.settimeout(timeout)
+        try:
+            data = self.reply.recv(MESSAGE_SIZE)
+        except socket.timeout:
+            raise subprocess.TimeoutExpired(f"fork-server crawl {self.pid}", timeout)
+        # No message means the fork server itself died
+        self.returncode = json.loads(data).get('returncode', -1) if data else -1
+        self.reply.close()
+        return self.returncode
+
+    def kill(self):
+        try:
+            os.kill(self.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class ForkServer:
+    """Start the zygote process and ask it to fork crawls"""
+
+    def __init__(self, scrapy_project_path, env=None):
+        self.scrapy_project_path = scrapy_project_path
+        self.env = env or dict(os.environ)
+        self.process = None
+        self.control = None
+        self.lock = threading.Lock()
+
+    def start(self, timeout=120):
+        """Start the zygote and wait until its imports are warm"""
+        parent_sock, child_sock = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve', str(child_sock.fileno())],
+            cwd=self.scrapy_project_path,
+            env=self.env,
+            pass_fds=(child_sock.fileno(),)
+        )
+        child_sock.close()
+
+        parent_sock.settimeout(timeout)
+        data = parent_sock.recv(MESSAGE_SIZE)
+        parent_sock.settimeout(None)
+        if not data:
+            raise RuntimeError("Fork server exited during warm-up")
+        self.control = parent_sock
+        ready = json.loads(data)
+        print(f"🍴 Fork server պատրաստ է (pid {ready['pid']}, warm-up {ready['warmup_seconds']:.1f} վրկ)")
+
+    def spawn(self, spider_name=None, stats_fd=None, probe=False, deadline=None):
+        """Fork one crawl; returns a Popen-like ForkedCrawl"""
+        with self.lock:
+            if self.process is None or self.process.poll() is not None:
+                print("🔄 Fork server-ը վերագործարկվում է")
+                self.stop()
+                self.start()
+
+            output_read, output_write = os.pipe()
+            reply_parent, reply_child = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+            devnull_fd = None
+            if stats_fd is None:
+                devnull_fd = stats_fd = os.open(os.devnull, os.O_WRONLY)
+            try:
+                _send(self.control, {'spider': spider_name, 'probe': probe, 'deadline': deadline},
+                      fds=[output_write, stats_fd, reply_child.fileno()])
+            finally:
+                # The zygote now holds its own copies
+                os.close(output_write)
+                reply_child.close()
+                if devnull_fd is not None:
+                    os.close(devnull_fd)
+
+        reply_parent.settimeout(30)
+        data = reply_parent.recv(MESSAGE_SIZE)
+        if not data:
+            os.close(output_read)
+            reply_parent.close()
+            raise RuntimeError("Fork server did not fork the crawl")
+        return ForkedCrawl(json.loads(data)['pid'], output_read, reply_parent)
+
+    def stop(self):
+        """Close the control socket; the zygote exits when it sees EOF"""
+        if self.control is not None:
+            self.control.close()
+            self.control = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.process = None
+
+
+# --- Benchmark ---------------------------------------------------------------
+
+def benchmark(scrapy_project_path, runs=5):
+    """Compare process startup latency: cold `python -c` imports vs a forked warm child"""
+    env = dict(os.environ)
+    env.update({
+        'SCRAPY_SETTINGS_MODULE': 'news_scraper.settings',
+        'PYTHONPATH': scrapy_project_path,
+        'PYTHONWARNINGS': 'ignore'
+    })
+
+    cold_probe = (
+        f"import {', '.join(WARM_IMPORTS)}\n"
+        "from scrapy.spiderloader import SpiderLoader\n"
+        "from scrapy.utils.project import get_project_settings\n"
+        "SpiderLoader.from_settings(get_project_settings())\n"
+    )
+    cold_times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', cold_probe], cwd=scrapy_project_path, env=env, check=True)
+        cold_times.append(time.perf_counter() - started)
+
+    server = ForkServer(scrapy_project_path, env=env)
+    server.start()
+    fork_times = []
+    try:
+        for _ in range(runs):
+            started = time.perf_counter()
+            crawl = server.spawn(probe=True)
+            crawl.stdout.read()
+            crawl.wait(timeout=60)
+            crawl.stdout.close()
+            fork_times.append(time.perf_counter() - started)
+    finally:
+        server.stop()
+
+    def median(values):
+        values = sorted(values)
+        return values[len(values) // 2]
+
+    print(f"🥶 Cold spawn:  median {median(cold_times) * 1000:.1f} ms, min {min(cold_times) * 1000:.1f} ms ({runs} runs)")
+    print(f"🍴 Fork server: median {median(fork_times) * 1000:.1f} ms, min {min(fork_times) * 1000:.1f} ms ({runs} runs)")
+    return cold_times, fork_times
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 3 and sys.argv[1] == '--serve':
+        sys.path.insert(0, os.getcwd())
+        serve(int(sys.argv[2]))
+    elif len(sys.argv) >= 2 and sys.argv[1] == '--benchmark':
+        project_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'news_scraper_group1')
+        benchmark(project_path, runs=int(sys.argv[2]) if len(sys.argv) >= 3 else 5)
+    else:
+        print("Usage: python fork_server.py --benchmark [runs]")
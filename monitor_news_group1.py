@@ -11,6 +11,8 @@ import requests
 print("🔍 Debug: requests imported")
 import json
 print("🔍 Debug: json imported")
+import threading
+from collections import deque
 from datetime import datetime, timedelta
 print("🔍 Debug: datetime imported")
 print("🔍 Debug: All imports completed")
@@ -19,6 +21,20 @@ print("🔍 Debug: All imports completed")
 import gc
 import psutil
 
+# Helper modules of the Scrapy project that don't need Scrapy (API endpoints, browser pool)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'news_scraper_group1'))
+from news_scraper.api_endpoints import get_resolver
+from news_scraper.browser_pool import get_pool as get_browser_pool
+
+# Default per-spider time budget (same for all runner modes). Spiders get the
+# budget as a deadline and stop on their own; they are killed only after the grace
+SPIDER_TIMEOUT_SECONDS = 120
+SPIDER_DEADLINE_GRACE_SECONDS = int(os.environ.get('SPIDER_DEADLINE_GRACE_SECONDS', 30))
+
+# Spider output: how many recent lines to keep for error reports, and whether to echo it live
+SPIDER_OUTPUT_TAIL_LINES = int(os.environ.get('SPIDER_OUTPUT_TAIL_LINES', 200))
+FORWARD_SPIDER_OUTPUT = os.environ.get('MONITOR_FORWARD_SPIDER_OUTPUT', '1') == '1'
+
 def cleanup_memory():
     """Memory cleanup function"""
     try:
@@ -44,28 +60,24 @@ class NewsMonitorAPI:
             'Content-Type': 'application/json',
             'User-Agent': 'NewsMonitor/1.0'
         })
+        # Endpoint URLs are resolved once per TTL and shared with the spiders' pipelines
+        self.endpoints = get_resolver(self.api_base_url)
         
     def test_connection(self):
         """API-ի կապի ստուգում"""
         try:
             print(f"🔗 Ստուգում ենք API կապը՝ {self.api_base_url}")
             
-            # Փորձում ենք հիմնական endpoint-ները
-            test_endpoints = [
-                f"{self.api_base_url}/",
-                f"{self.api_base_url}/api/",
-                f"{self.api_base_url}/health/",
-                f"{self.api_base_url}/status/"
-            ]
-            
-            for endpoint in test_endpoints:
+            endpoint = self.endpoints.resolve('health')
+            if endpoint:
                 try:
+                    # The URL may come from the cache, so check the API answers now
                     response = self.session.get(endpoint, timeout=5)
                     if response.status_code in [200, 404]:  # 404-ը նույնպես OK է, նշանակում է endpoint գոյություն ունի
                         print(f"✅ API կապ հաջող՝ {endpoint}")
                         return True
-                except:
-                    continue
+                except requests.exceptions.RequestException as e:
+                    print(f"⚠️ Network error {endpoint}: {e}")
             
             print(f"⚠️ API կապի խնդիր՝ {self.api_base_url}")
             return False
@@ -75,122 +87,216 @@ class NewsMonitorAPI:
             return False
     
     def cleanup_old_articles(self, days_to_keep):
-        """Հին հոդվածների մաքրում API-ի միջոցով"""
+        """Հին հոդվածների մաքրում API-ի միջոցով
+        
+        Returns the number of deleted articles, or None if the cleanup failed.
+        """
         try:
             cleanup_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
             print(f"🧹 Փորձում ենք մաքրել հոդվածները {cleanup_date} ամսաթվից առաջ...")
             
-            # Փորձում ենք տարբեր endpoint-ներ
-            endpoints_to_try = [
-                f"{self.api_base_url}/api/articles/cleanup/",
-                f"{self.api_base_url}/api/cleanup/",
-                f"{self.api_base_url}/api/articles/",
-                f"{self.api_base_url}/cleanup/"
-            ]
+            endpoint = self.endpoints.resolve('cleanup')
+            if not endpoint:
+                print("❌ Cleanup endpoint չի գտնվել")
+                return None
             
-            for endpoint in endpoints_to_try:
-                try:
-                    print(f"🔗 Փորձում ենք endpoint՝ {endpoint}")
-                    response = self.session.delete(
-                        endpoint,
-                        params={'before_date': cleanup_date},
-                        timeout=10
-                    )
+            try:
+                response = self.session.delete(
+                    endpoint,
+                    params={'before_date': cleanup_date},
+                    timeout=10
+                )
+                
+                if response.status_code == 200:
+                    data = response.json()
+                    deleted_count = data.get('deleted_count', 0)
+                    print(f"✅ Հաջողությամբ մաքրվեց {deleted_count} հոդված")
+                    return deleted_count
+                elif response.status_code in (404, 405):
+                    print(f"⚠️ Endpoint չի աշխատում՝ {endpoint}")
+                    # Rediscover on the next run
+                    self.endpoints.invalidate('cleanup')
+                else:
+                    print(f"❌ API cleanup error: {response.status_code} - {response.text}")
                     
-                    if response.status_code == 200:
-                        data = response.json()
-                        deleted_count = data.get('deleted_count', 0)
-                        print(f"✅ Հաջողությամբ մաքրվեց {deleted_count} հոդված")
-                        return deleted_count
-                    elif response.status_code == 404:
-                        print(f"⚠️ Endpoint չի գտնվել՝ {endpoint}")
-                        continue
-                    else:
-                        print(f"❌ API cleanup error: {response.status_code} - {response.text}")
-                        continue
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"⚠️ Network error {endpoint}: {e}")
-                    continue
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ Network error {endpoint}: {e}")
             
-            print("❌ Ոչ մի endpoint չաշխատեց")
-            return 0
+            return None
             
         except Exception as e:
             print(f"❌ API cleanup exception: {e}")
-            return 0
+            return None
     
     def get_keywords(self):
         """Բանալի բառերի ստացում API-ից"""
         try:
             print(f"🔍 Փորձում ենք ստանալ բանալի բառեր...")
             
-            # Փորձում ենք տարբեր endpoint-ներ
-            endpoints_to_try = [
-                f"{self.api_base_url}/api/keywords/",
-                f"{self.api_base_url}/api/keywords",
-                f"{self.api_base_url}/keywords/",
-                f"{self.api_base_url}/keywords"
-            ]
+            endpoint = self.endpoints.resolve('keywords')
+            if not endpoint:
+                print("❌ Ոչ մի keywords endpoint չաշխատեց")
+                return []
             
-            for endpoint in endpoints_to_try:
-                try:
-                    print(f"🔗 Փորձում ենք endpoint՝ {endpoint}")
-                    response = self.session.get(endpoint, timeout=10)
+            try:
+                response = self.session.get(endpoint, timeout=10)
+                
+                if response.status_code == 200:
+                    keywords = response.json()
+                    print(f"✅ Ստացվեց {len(keywords)} բանալի բառ")
+                    return keywords
+                elif response.status_code == 404:
+                    print(f"⚠️ Endpoint չի գտնվել՝ {endpoint}")
+                    self.endpoints.invalidate('keywords')
+                else:
+                    print(f"❌ API keywords error: {response.status_code} - {response.text}")
                     
-                    if response.status_code == 200:
-                        keywords = response.json()
-                        print(f"✅ Ստացվեց {len(keywords)} բանալի բառ")
-                        return keywords
-                    elif response.status_code == 404:
-                        print(f"⚠️ Endpoint չի գտնվել՝ {endpoint}")
-                        continue
-                    else:
-                        print(f"❌ API keywords error: {response.status_code} - {response.text}")
-                        continue
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"⚠️ Network error {endpoint}: {e}")
-                    continue
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️ Network error {endpoint}: {e}")
             
-            print("❌ Ոչ մի keywords endpoint չաշխատեց")
             return []
             
         except Exception as e:
             print(f"❌ API keywords exception: {e}")
             return []
 
-def run_scrapy_with_reactor_fix(spider_name, scrapy_project_path):
-    """Run scrapy with reactor signal handling fix"""
+def read_stats_pipe(read_fd):
+    """Read the JSON summary records a spider wrote to its stats pipe"""
+    chunks = []
     try:
-        # Set environment variables to fix reactor issues
-        env = dict(os.environ)
-        env.update({
-            'SCRAPY_SETTINGS_MODULE': 'news_scraper.settings',
-            'PYTHONPATH': scrapy_project_path,
-            # Disable signal handling that causes issues in containerized environments
-            'TWISTED_DISABLE_SIGNAL_HANDLERS': '1',
-            'TWISTED_NO_SIGNAL_HANDLERS': '1',
-            # Suppress all warnings
-            'PYTHONWARNINGS': 'ignore'
-        })
+        # The spider has exited; don't block if a leftover child still holds the write end
+        os.set_blocking(read_fd, False)
+        while True:
+            try:
+                chunk = os.read(read_fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+    finally:
+        os.close(read_fd)
+    
+    records = []
+    for line in b''.join(chunks).decode('utf-8', errors='replace').splitlines():
+        if line.strip():
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                print(f"⚠️ Stats record-ը չհաջողվեց կարդալ: {line[:200]}")
+    return records
+
+def stream_spider_output(process, spider_name, tail, summary_lines, forward=True):
+    """Forward a spider's output line by line, keeping only a bounded tail
+
+    `tail` and `summary_lines` are bounded deques, so memory stays flat no
+    matter how much the spider logs. Summary block lines are picked out on
+    the fly as they pass.
+    """
+    in_summary = False
+    for line in process.stdout:
+        line = line.rstrip('\n')
+        tail.append(line)
         
-        # Use simple scrapy crawl command with environment variables
-        result = subprocess.run([
-            sys.executable, '-m', 'scrapy', 'crawl', spider_name
-        ], 
-            cwd=scrapy_project_path,
-            capture_output=True,
-            text=True,
-            timeout=120,  # 2 minutes per spider
-            env=env
+        if '📊 ԱՄՓՈՓՈՒՄ' in line:
+            in_summary = True
+            summary_lines.append(line.strip())
+        elif in_summary and line.strip().startswith('•'):
+            summary_lines.append(line.strip())
+        else:
+            in_summary = False
+        
+        if forward:
+            print(f"    [{spider_name}] {line}")
+
+def build_spider_env(scrapy_project_path):
+    """Environment for spider processes (subprocess runs and the fork server)"""
+    # Set environment variables to fix reactor issues
+    env = dict(os.environ)
+    env.update({
+        'SCRAPY_SETTINGS_MODULE': 'news_scraper.settings',
+        'PYTHONPATH': scrapy_project_path,
+        # Disable signal handling that causes issues in containerized environments
+        'TWISTED_DISABLE_SIGNAL_HANDLERS': '1',
+        'TWISTED_NO_SIGNAL_HANDLERS': '1',
+        # Suppress all warnings
+        'PYTHONWARNINGS': 'ignore'
+    })
+    return env
+
+def run_scrapy_with_reactor_fix(spider_name, scrapy_project_path, timeout=SPIDER_TIMEOUT_SECONDS, fork_server=None):
+    """Run scrapy with reactor signal handling fix
+    
+    With a fork_server the crawl is forked from the pre-warmed zygote
+    (see fork_server.py) instead of starting a fresh interpreter.
+    
+    The spider gets `timeout` as a deadline (see news_scraper/deadline.py)
+    and winds down by itself; it is killed only if it is still running
+    SPIDER_DEADLINE_GRACE_SECONDS later.
+    """
+    read_fd = None
+    tail = deque(maxlen=SPIDER_OUTPUT_TAIL_LINES)
+    summary_lines = deque(maxlen=50)
+    try:
+        # Pipe for the spider's JSON run summary (see news_scraper/run_stats.py)
+        read_fd, write_fd = os.pipe()
+        deadline = time.time() + timeout
+        
+        # stdout and stderr are merged and streamed instead of captured whole
+        try:
+            if fork_server:
+                # Forked from the warm zygote; the handle behaves like Popen
+                process = fork_server.spawn(spider_name, stats_fd=write_fd, deadline=deadline)
+            else:
+                env = build_spider_env(scrapy_project_path)
+                env['SPIDER_STATS_FD'] = str(write_fd)
+                
+                # Use simple scrapy crawl command with environment variables
+                process = subprocess.Popen([
+                    sys.executable, '-m', 'scrapy', 'crawl', spider_name, '-a', f'deadline={deadline}'
+                ], 
+                    cwd=scrapy_project_path,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                    encoding='utf-8',
+                    errors='replace',
+                    bufsize=1,
+                    env=env,
+                    pass_fds=(write_fd,)
+                )
+        finally:
+            os.close(write_fd)
+        
+        reader = threading.Thread(
+            target=stream_spider_output,
+            args=(process, spider_name, tail, summary_lines, FORWARD_SPIDER_OUTPUT),
+            name=f'output-{spider_name}',
+            daemon=True
         )
+        reader.start()
+        
+        timed_out = False
+        try:
+            returncode = process.wait(timeout=timeout + SPIDER_DEADLINE_GRACE_SECONDS)
+        except subprocess.TimeoutExpired:
+            timed_out = True
+            process.kill()
+            returncode = process.wait()
+        reader.join(timeout=5)
+        
+        from types import SimpleNamespace
+        result = SimpleNamespace()
+        result.returncode = returncode
+        result.stdout = '\n'.join(tail)
+        result.stderr = f"Spider timed out after {timeout + SPIDER_DEADLINE_GRACE_SECONDS} seconds" if timed_out else ""
+        result.timed_out = timed_out
+        result.summary_lines = list(summary_lines)
+        result.stats = read_stats_pipe(read_fd)
+        read_fd = None
         
-        # Print full error details for debugging
         if result.returncode != 0:
             print(f"❌ Spider {spider_name} failed with return code: {result.returncode}")
-            print(f"📄 STDOUT: {result.stdout}")
-            print(f"❌ STDERR: {result.stderr}")
         
         # Memory cleanup after spider finishes
         memory_usage = cleanup_memory()
@@ -200,14 +306,73 @@ def run_scrapy_with_reactor_fix(spider_name, scrapy_project_path):
         
     except Exception as reactor_error:
         print(f"❌ Scrapy crawl failed: {reactor_error}")
+        if read_fd is not None:
+            os.close(read_fd)
         # Return a mock result to prevent crashes
         from types import SimpleNamespace
         mock_result = SimpleNamespace()
         mock_result.returncode = 1
-        mock_result.stdout = ""
+        mock_result.stdout = '\n'.join(tail)
         mock_result.stderr = f"Scrapy crawl failed: {reactor_error}"
+        mock_result.summary_lines = list(summary_lines)
+        mock_result.stats = []
         return mock_result
 
+def load_spider_manifest(scrapy_project_path):
+    """Load the precompiled spider manifest, regenerating it only when stale
+
+    The manifest (news_scraper_group1/spider_manifest.json) is checked
+    against a names-and-sizes fingerprint of the spider files; only a stale
+    manifest is rebuilt through Scrapy's SPIDER_MODULES loader.
+    """
+    if scrapy_project_path not in sys.path:
+        sys.path.insert(0, scrapy_project_path)
+    try:
+        from news_scraper import manifest as spider_manifest
+    except ImportError as e:
+        print(f"⚠️ Spider manifest module չկա: {e}")
+        return None
+    
+    manifest_path = os.path.join(scrapy_project_path, 'spider_manifest.json')
+    spiders_dir = os.path.join(scrapy_project_path, 'news_scraper', 'spiders')
+    
+    try:
+        manifest = spider_manifest.load_manifest(manifest_path)
+        if not spider_manifest.is_stale(manifest, spiders_dir):
+            return manifest
+    except Exception as e:
+        print(f"⚠️ Spider manifest ստուգման սխալ: {e}")
+        return None
+    
+    print("🔄 Spider manifest-ը հնացած է, վերակառուցում ենք SPIDER_MODULES loader-ով...")
+    try:
+        env = dict(os.environ)
+        env.update({
+            'SCRAPY_SETTINGS_MODULE': 'news_scraper.settings',
+            'PYTHONPATH': scrapy_project_path,
+            'PYTHONWARNINGS': 'ignore'
+        })
+        result = subprocess.run(
+            [sys.executable, '-m', 'news_scraper.manifest'],
+            cwd=scrapy_project_path,
+            capture_output=True,
+            text=True,
+            timeout=60,
+            env=env
+        )
+        if result.returncode == 0:
+            print(result.stdout.strip())
+            return spider_manifest.load_manifest(manifest_path)
+        print(f"❌ Manifest վերակառուցման սխալ: {result.stderr[-500:]}")
+    except Exception as e:
+        print(f"❌ Manifest վերակառուցման սխալ: {e}")
+    
+    # A stale manifest is still better than scanning files
+    if manifest and manifest.get('spiders'):
+        print("⚠️ Օգտագործում ենք հնացած manifest-ը")
+        return manifest
+    return None
+
 def get_spiders_list(scrapy_project_path):
     """Get list of available spiders by scanning spider files directly"""
     spiders = []
@@ -316,16 +481,6 @@ except Exception as subprocess_error:
         except Exception as e:
             print(f"❌ Scrapy loader սխալ: {e}")
     
-    # Method 3: Hardcoded fallback for common spider names
-    if not spiders:
-        print("🔄 Փորձում ենք ստանդարտ spider անուններ...")
-        common_spiders = ['asbarez', 'aravot', 'news_am', 'panorama', 'hetq']
-        for spider_name in common_spiders:
-            spider_file = os.path.join(spiders_dir, f'{spider_name}.py')
-            if os.path.exists(spider_file):
-                spiders.append(spider_name)
-                print(f"✅ Ստանդարտ spider գտնված՝ {spider_name}")
-    
     return list(set(spiders))  # Remove duplicates
 
 def check_project_structure(scrapy_project_path):
@@ -380,6 +535,156 @@ def check_project_structure(scrapy_project_path):
         except Exception as e:
             print(f"❌ Could not list spiders directory: {e}")
 
+def run_spider(spider_name, scrapy_project_path, crawler_runner=None, timeout=SPIDER_TIMEOUT_SECONDS,
+               fork_server=None):
+    """Run one spider with the configured runner"""
+    if crawler_runner:
+        return crawler_runner.crawl(spider_name, timeout=timeout, grace=SPIDER_DEADLINE_GRACE_SECONDS)
+    return run_scrapy_with_reactor_fix(spider_name, scrapy_project_path, timeout=timeout, fork_server=fork_server)
+
+def report_spider_result(spider_name, result):
+    """Print a finished spider run from its JSON summary records"""
+    records = getattr(result, 'stats', None) or []
+    if result.returncode == 0:
+        for record in records:
+            print(f"    ԽՈՒՄԲ 1 - 📊 {spider_name}: ստուգված {record.get('processed_articles', 0)}, "
+                  f"նոր {record.get('new_articles', 0)}, կրկնություն {record.get('duplicate_articles', 0)}, "
+                  f"cache {record.get('cached_skips', 0)}, բլոկ {record.get('blocked_attempts', 0)}")
+            stage_seconds = record.get('stage_seconds', {})
+            stages = ', '.join(f"{stage} {seconds:.1f}վ" for stage, seconds in stage_seconds.items())
+            print(f"    ԽՈՒՄԲ 1 - ⏱️ {spider_name}: {record.get('duration_seconds', 0):.1f} վրկ ({stages or '-'}), "
+                  f"peak RSS {record.get('peak_rss_mb', 0):.1f} MB"
+                  f"{', ⏳ կանգնեց deadline-ի պատճառով' if record.get('deadline_hit') else ''}")
+        
+        if not records:
+            print(f"    ԽՈՒՄԲ 1 - {spider_name}: Ամփոփման record չստացվեց")
+            # Fall back to the summary block picked out of the output stream
+            for line in getattr(result, 'summary_lines', None) or []:
+                print(f"    ԽՈՒՄԲ 1 - {line}")
+            if result.stderr:
+                print(f"    ԽՈՒՄԲ 1 - {spider_name} stderr: {result.stderr[-300:]}")
+        
+        print(f"✅ ԽՈՒՄԲ 1 - {spider_name} ավարտված")
+    else:
+        # Print full error details
+        print(f"❌ ԽՈՒՄԲ 1 - {spider_name} սխալ (return code: {result.returncode})")
+        if result.stdout:
+            # Only the last SPIDER_OUTPUT_TAIL_LINES lines are kept
+            print(f"📄 STDOUT (վերջին տողեր): {result.stdout}")
+        if result.stderr:
+            print(f"❌ STDERR: {result.stderr}")
+        
+        # If it's a critical error, skip this spider for this cycle
+        error_msg = result.stderr if result.stderr else "Unknown error"
+        if "Could not find spider class" in error_msg or "ImportError" in error_msg:
+            print(f"⚠️ ԽՈՒՄԲ 1 - {spider_name} բաց թողնված այս ցիկլում")
+
+def report_spider_error(spider_name, error):
+    """Print a spider run that raised instead of returning a result"""
+    if isinstance(error, subprocess.TimeoutExpired):
+        print(f"⏰ ԽՈՒՄԲ 1 - {spider_name} timeout (2 րոպե)")
+        print(f"🔍 Debug: Spider {spider_name} took too long, skipping...")
+    else:
+        print(f"❌ ԽՈՒՄԲ 1 - {spider_name} սխալ: {error}")
+
+def get_spider_counts(result):
+    """New-article and cache-skip counts from a spider's JSON summary
+
+    Links of an unchanged listing are already in cached_skips; a run that only
+    reports listing_unchanged still counts as one zero-churn sample.
+    """
+    records = getattr(result, 'stats', None) if result is not None else None
+    if not records or result.returncode != 0:
+        return None, None
+    new_articles = sum(record.get('new_articles', 0) for record in records)
+    cached_skips = sum(record.get('cached_skips', 0) for record in records)
+    if not new_articles and not cached_skips:
+        cached_skips = sum(record.get('listing_unchanged', 0) for record in records)
+    return new_articles, cached_skips
+
+def get_spider_run_time(result, budget):
+    """Run duration and whether the deadline cut the run short
+    
+    A run that was killed after the grace period counts as a deadline hit
+    at its full budget; a run with no summary at all gives (None, False).
+    """
+    if result is None:
+        return None, False
+    records = getattr(result, 'stats', None)
+    if records:
+        return (sum(record.get('duration_seconds', 0) for record in records),
+                any(record.get('deadline_hit') for record in records))
+    if getattr(result, 'timed_out', False):
+        return budget, True
+    return None, False
+
+def summarize_cycle(results):
+    """Aggregate the JSON summaries of all spiders that ran this cycle"""
+    fields = ['processed_articles', 'new_articles', 'duplicate_articles', 'cached_skips', 'blocked_attempts',
+              'listing_unchanged']
+    totals = dict.fromkeys(fields, 0)
+    reported = 0
+    peak_rss_mb = 0
+    for result in results.values():
+        for record in getattr(result, 'stats', None) or []:
+            reported += 1
+            for field in fields:
+                totals[field] += record.get(field, 0)
+            peak_rss_mb = max(peak_rss_mb, record.get('peak_rss_mb', 0))
+    
+    print(f"📊 ԽՈՒՄԲ 1 - Ցիկլի ամփոփում ({reported}/{len(results)} սարդ): "
+          f"ստուգված {totals['processed_articles']}, նոր {totals['new_articles']}, "
+          f"կրկնություն {totals['duplicate_articles']}, cache {totals['cached_skips']}, "
+          f"բլոկ {totals['blocked_attempts']}, անփոփոխ ցանկ {totals['listing_unchanged']}, "
+          f"max peak RSS {peak_rss_mb:.1f} MB")
+    return totals
+
+def get_worker_pool_size(spider_count):
+    """Number of parallel spider workers that fit in the RSS budget
+
+    Every worker owns a Chrome instance, so the pool is sized by memory:
+    SPIDER_RSS_BUDGET_MB (capped by currently available memory) divided by
+    the expected RSS of one worker, SPIDER_WORKER_RSS_MB.
+    """
+    budget_mb = int(os.environ.get('SPIDER_RSS_BUDGET_MB', 512))
+    worker_mb = max(1, int(os.environ.get('SPIDER_WORKER_RSS_MB', 250)))
+    
+    try:
+        available_mb = psutil.virtual_memory().available / 1024 / 1024
+        budget_mb = min(budget_mb, available_mb)
+    except Exception as e:
+        print(f"⚠️ Available memory check error: {e}")
+    
+    pool_size = int(budget_mb // worker_mb)
+    return max(1, min(pool_size, spider_count))
+
+def run_spiders_parallel(spiders, scrapy_project_path, pool_size, budgets=None, fork_server=None):
+    """Run spiders in a bounded worker pool and report results as they complete"""
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    results = {}
+    cycle_start = time.time()
+    with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='spider') as executor:
+        futures = {}
+        for spider_name in spiders:
+            print(f"🕷️ ԽՈՒՄԲ 1 - Հերթագրվում է սարդը՝ {spider_name}")
+            timeout = budgets.budget(spider_name) if budgets else SPIDER_TIMEOUT_SECONDS
+            future = executor.submit(run_spider, spider_name, scrapy_project_path, None, timeout, fork_server)
+            futures[future] = (spider_name, time.time())
+        
+        for future in as_completed(futures):
+            spider_name, submitted_at = futures[future]
+            print(f"🏁 ԽՈՒՄԲ 1 - {spider_name} վերադարձավ {time.time() - submitted_at:.1f} վրկ-ում")
+            try:
+                results[spider_name] = future.result()
+                report_spider_result(spider_name, results[spider_name])
+            except Exception as e:
+                results[spider_name] = None
+                report_spider_error(spider_name, e)
+    
+    print(f"⏱️ ԽՈՒՄԲ 1 - Զուգահեռ ցիկլի տևողություն՝ {time.time() - cycle_start:.1f} վրկ ({pool_size} worker)")
+    return results
+
 def main():
     print("🏢 ԽՈՒՄԲ 1 - Մեծ նյուզ սայտերի մոնիտորինգ (news_scraper_group1)")
     print("🔍 Debug: main() function started")
@@ -388,8 +693,14 @@ def main():
     interval_minutes = int(os.environ.get('MONITOR_INTERVAL_MINUTES', 7))
     days_to_keep = int(os.environ.get('DAYS_TO_KEEP_ARTICLES', 7))
     api_base_url = os.environ.get('API_BASE_URL', 'https://beackkayq.onrender.com')
+    runner_mode = os.environ.get('MONITOR_RUNNER_MODE', 'subprocess').lower()
+    parallel_spiders = os.environ.get('MONITOR_PARALLEL_SPIDERS', '0') == '1'
+    adaptive_schedule = os.environ.get('MONITOR_ADAPTIVE_SCHEDULE', '0') == '1'
     
     print(f"🌐 API Base URL: {api_base_url}")
+    print(f"🔍 Debug: runner_mode = {runner_mode}")
+    print(f"🔍 Debug: parallel_spiders = {parallel_spiders}")
+    print(f"🔍 Debug: adaptive_schedule = {adaptive_schedule}")
     print(f"🔍 Debug: interval_minutes = {interval_minutes}")
     print(f"🔍 Debug: days_to_keep = {days_to_keep}")
     
@@ -434,11 +745,18 @@ def main():
     # Set up Scrapy environment for GROUP 1
     scrapy_project_path = os.path.join(os.path.dirname(__file__), 'news_scraper_group1')
     
-    # Debug project structure
-    check_project_structure(scrapy_project_path)
-    
-    # Get available spiders with improved method
-    spiders = get_spiders_list(scrapy_project_path)
+    # Spiders and their metadata come from the precompiled manifest
+    manifest = load_spider_manifest(scrapy_project_path)
+    spider_info = manifest['spiders'] if manifest else {}
+    spiders = list(spider_info)
+    if spiders:
+        print(f"📋 Spider manifest՝ {len(spiders)} սարդ")
+    else:
+        # Debug project structure
+        check_project_structure(scrapy_project_path)
+        
+        # Get available spiders by scanning the spider files
+        spiders = get_spiders_list(scrapy_project_path)
     
     if not spiders:
         print("❌ ԽՈՒՄԲ 1 - Սարդեր չեն գտնվել։")
@@ -468,6 +786,83 @@ def main():
     
     print(f"✅ ԽՈՒՄԲ 1 - Գտնված սարդեր՝ {', '.join(spiders)}")
 
+    # Long-lived in-process runner: one reactor and one set of imports for all cycles
+    crawler_runner = None
+    if runner_mode == 'inprocess':
+        try:
+            from crawler_runner import InProcessCrawlerRunner
+            crawler_runner = InProcessCrawlerRunner(scrapy_project_path, cleanup_callback=cleanup_memory)
+            crawler_runner.start()
+        except Exception as e:
+            print(f"⚠️ In-process runner չհաջողվեց, օգտագործում ենք subprocess: {e}")
+            crawler_runner = None
+
+    # Zygote that imports Scrapy and the spiders once and forks a child per crawl
+    fork_server = None
+    if runner_mode == 'forkserver':
+        try:
+            from fork_server import ForkServer
+            fork_server = ForkServer(scrapy_project_path, env=build_spider_env(scrapy_project_path))
+            fork_server.start()
+        except Exception as e:
+            print(f"⚠️ Fork server չհաջողվեց, օգտագործում ենք subprocess: {e}")
+            fork_server = None
+
+    # Parallel workers are separate spider processes; the in-process runner shares one reactor
+    if parallel_spiders and crawler_runner:
+        print("⚠️ Զուգահեռ ռեժիմը աշխատում է միայն subprocess runner-ով, սարդերը կաշխատեն հերթով")
+        parallel_spiders = False
+
+    # Per-site schedule learned from each site's new-article rate
+    scheduler = None
+    if adaptive_schedule:
+        from spider_scheduler import AdaptiveSpiderScheduler
+        min_interval_minutes = float(os.environ.get('SPIDER_MIN_INTERVAL_MINUTES', 2))
+        max_interval_minutes = float(os.environ.get('SPIDER_MAX_INTERVAL_MINUTES', 30))
+        scheduler = AdaptiveSpiderScheduler(
+            spiders,
+            state_file=os.environ.get('SCHEDULER_STATE_FILE', os.path.join(os.path.dirname(__file__), 'logs', 'spider_schedule.json')),
+            initial_interval=interval_minutes * 60,
+            initial_intervals={name: info['default_interval_minutes'] * 60
+                               for name, info in spider_info.items() if info.get('default_interval_minutes')},
+            min_interval=min_interval_minutes * 60,
+            max_interval=max_interval_minutes * 60
+        )
+        print(f"📅 Adaptive schedule՝ {min_interval_minutes}-{max_interval_minutes} րոպե")
+
+    # Per-site time budgets learned from each site's run durations
+    from spider_budgets import SpiderTimeBudgets
+    budgets = SpiderTimeBudgets(
+        spiders,
+        state_file=os.environ.get('SPIDER_BUDGET_STATE_FILE', os.path.join(os.path.dirname(__file__), 'logs', 'spider_budgets.json')),
+        default_budget=SPIDER_TIMEOUT_SECONDS,
+        initial_budgets={name: info['timeout_seconds'] for name, info in spider_info.items() if info.get('timeout_seconds')},
+        min_budget=float(os.environ.get('SPIDER_MIN_BUDGET_SECONDS', 60)),
+        max_budget=float(os.environ.get('SPIDER_MAX_BUDGET_SECONDS', 600))
+    )
+
+    # Warm Chrome browsers that outlive individual crawls (see news_scraper/browser_pool.py)
+    try:
+        browser_pool = get_browser_pool()
+        if browser_pool.enabled:
+            print(f"♻️ Browser pool՝ {browser_pool.warm_up()}/{browser_pool.size} Chrome պատրաստ է")
+        else:
+            print("⚠️ Browser pool-ն անջատված է (BROWSER_POOL_SIZE=0 կամ Chrome չի գտնվել), սարդերը կսկսեն իրենց Chrome-ը")
+    except Exception as e:
+        browser_pool = None
+        print(f"⚠️ Browser pool-ը չսկսվեց, սարդերը կսկսեն իրենց Chrome-ը: {e}")
+
+    # Old articles are cleaned up in the background, on their own schedule;
+    # it also runs when the API was down at startup and backs off until it answers
+    from retention_cleanup import RetentionCleanupScheduler
+    retention_cleanup = RetentionCleanupScheduler(
+        NewsMonitorAPI(api_base_url),
+        days_to_keep,
+        interval=float(os.environ.get('CLEANUP_INTERVAL_MINUTES', 60)) * 60,
+        retry_delay=float(os.environ.get('CLEANUP_RETRY_SECONDS', 60))
+    )
+    retention_cleanup.start()
+
     cycle_count = 0
     
     try:
@@ -475,73 +870,72 @@ def main():
             cycle_count += 1
             print(f"\n🔄 ԽՈՒՄԲ 1 - Ցիկլ #{cycle_count} - {datetime.now().strftime('%H:%M:%S')}")
             
-            # Cleanup old articles via API (only if API is connected)
-            if api_connected:
-                deleted_count = api_client.cleanup_old_articles(days_to_keep)
-                if deleted_count > 0:
-                    print(f"🗑️ ԽՈՒՄԲ 1 - API-ի միջոցով մաքրվել է {deleted_count} հին հոդված")
-                else:
-                    print("⚠️ API cleanup բաց թողնված (կապ չկա)")
+            # With the adaptive schedule only the spiders that are due run this cycle
+            cycle_spiders = scheduler.due_spiders() if scheduler else spiders
+            print(f"🕷️ ԽՈՒՄԲ 1 - Այս ցիկլի սարդեր՝ {', '.join(cycle_spiders)}")
 
-            # Run each spider with reactor fix
-            for spider_name in spiders:
-                print(f"🕷️ ԽՈՒՄԲ 1 - Սկսվում է սարդը՝ {spider_name}")
-                print(f"🔍 Debug: Spider {spider_name} start time: {datetime.now().strftime('%H:%M:%S')}")
-                
-                try:
-                    result = run_scrapy_with_reactor_fix(spider_name, scrapy_project_path)
+            # Pool size follows the memory that is available right now
+            pool_size = get_worker_pool_size(len(cycle_spiders)) if parallel_spiders and cycle_spiders else 1
+            if pool_size > 1:
+                # Run spiders concurrently, reporting each one as it completes
+                results = run_spiders_parallel(cycle_spiders, scrapy_project_path, pool_size, budgets, fork_server)
+            else:
+                results = {}
+                # Run each spider with reactor fix
+                for spider_name in cycle_spiders:
+                    print(f"🕷️ ԽՈՒՄԲ 1 - Սկսվում է սարդը՝ {spider_name}")
+                    print(f"🔍 Debug: Spider {spider_name} start time: {datetime.now().strftime('%H:%M:%S')}")
                     
-                    if result.returncode == 0:
-                        # Extract key info from output
-                        lines = result.stdout.split('\n')
-                        found_output = False
-                        for line in lines:
-                            if any(keyword in line for keyword in ['📊 ԱՄՓՈՓՈՒՄ', '✅ Բանալի բառ գտնվեց', '💾 Նոր հոդված', '🔄 Կրկնություն', '📄 Հոդված', '🔍 Գտնված', '📰 Գտնվել է', '✅ Բանալի բառ գտնվեց', '❌ Բանալի բառ չգտնվեց']):
-                                print(f"    ԽՈՒՄԲ 1 - {line.strip()}")
-                                found_output = True
-                        
-                        if not found_output:
-                            print(f"    ԽՈՒՄԲ 1 - {spider_name}: Ոչ մի հոդված չի գտնվել")
-                            # Show first few lines of stdout for debugging
-                            if result.stdout:
-                                print(f"    ԽՈՒՄԲ 1 - {spider_name} stdout preview: {result.stdout[:300]}...")
-                        
-                        # Show stderr if there are any errors
-                        if result.stderr:
-                            print(f"    ԽՈՒՄԲ 1 - {spider_name} stderr: {result.stderr[:200]}...")
-                        
-                        print(f"✅ ԽՈՒՄԲ 1 - {spider_name} ավարտված")
-                    else:
-                        # Print full error details
-                        print(f"❌ ԽՈՒՄԲ 1 - {spider_name} սխալ (return code: {result.returncode})")
-                        if result.stdout:
-                            print(f"📄 STDOUT: {result.stdout}")
-                        if result.stderr:
-                            print(f"❌ STDERR: {result.stderr}")
-                        
-                        # If it's a critical error, skip this spider for this cycle
-                        error_msg = result.stderr if result.stderr else "Unknown error"
-                        if "Could not find spider class" in error_msg or "ImportError" in error_msg:
-                            print(f"⚠️ ԽՈՒՄԲ 1 - {spider_name} բաց թողնված այս ցիկլում")
-                        
-                except subprocess.TimeoutExpired:
-                    print(f"⏰ ԽՈՒՄԲ 1 - {spider_name} timeout (2 րոպե)")
-                    print(f"🔍 Debug: Spider {spider_name} took too long, skipping...")
-                except Exception as e:
-                    print(f"❌ ԽՈՒՄԲ 1 - {spider_name} սխալ: {e}")
-                    # Continue with next spider instead of crashing
-                    continue
+                    try:
+                        timeout = budgets.budget(spider_name)
+                        results[spider_name] = run_spider(spider_name, scrapy_project_path, crawler_runner, timeout, fork_server)
+                        report_spider_result(spider_name, results[spider_name])
+                    except Exception as e:
+                        results[spider_name] = None
+                        report_spider_error(spider_name, e)
+                        # Continue with next spider instead of crashing
+                        continue
 
+            summarize_cycle(results)
             print(f"✅ ԽՈՒՄԲ 1 - Ցիկլ #{cycle_count} ավարտված")
-            print(f"😴 ԽՈՒՄԲ 1 - Հաջորդ ստուգումը՝ {interval_minutes} րոպեից...")
+
+            # Relaunch browsers that were recycled during the cycle while the monitor sleeps
+            if browser_pool and browser_pool.enabled:
+                browser_pool.warm_up()
+
+            for spider_name in cycle_spiders:
+                budget = budgets.budget(spider_name)
+                duration, deadline_hit = get_spider_run_time(results.get(spider_name), budget)
+                next_budget = budgets.record_run(spider_name, duration, deadline_hit)
+                if next_budget != budget:
+                    print(f"⏳ ԽՈՒՄԲ 1 - {spider_name} time budget՝ {budget:.0f} → {next_budget:.0f} վրկ")
+
+            if scheduler:
+                for spider_name in cycle_spiders:
+                    new_articles, cached_skips = get_spider_counts(results.get(spider_name))
+                    next_interval = scheduler.record_result(spider_name, new_articles, cached_skips)
+                    print(f"📅 ԽՈՒՄԲ 1 - {spider_name} հաջորդը՝ {next_interval / 60:.1f} րոպեից")
+                sleep_seconds = scheduler.seconds_until_next()
+            else:
+                sleep_seconds = interval_minutes * 60
+            
+            print(f"😴 ԽՈՒՄԲ 1 - Հաջորդ ստուգումը՝ {sleep_seconds / 60:.1f} րոպեից...")
             
-            # Sleep for the specified interval
-            time.sleep(interval_minutes * 60)
+            # Sleep until the next check
+            time.sleep(sleep_seconds)
             
     except KeyboardInterrupt:
         print("\n🛑 ԽՈՒՄԲ 1 - Մոնիտորինգը դադարեցվել է օգտագործողի կողմից")
     except Exception as e:
         print(f"❌ ԽՈՒՄԲ 1 - Ընդհանուր սխալ: {e}")
+    finally:
+        retention_cleanup.stop()
+        if browser_pool:
+            browser_pool.shutdown()
+        if crawler_runner:
+            crawler_runner.stop()
+        if fork_server:
+            fork_server.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+# Shared API endpoint resolution
+#
+# The API has been deployed under several URL layouts (/api/keywords/,
+# /keywords, ...). EndpointResolver probes the candidate URLs of a logical
+# endpoint concurrently, keeps the preferred one that answers, and caches the
+# resolved map on disk with a TTL. The monitor, its cleanup thread and every
+# spider's pipeline share that cache, so each endpoint is probed at most once
+# per TTL instead of on every call.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_API_BASE_URL = 'https://beackkayq.onrender.com'
+CACHE_FILE = os.environ.get('API_ENDPOINT_CACHE_FILE',
+                            os.path.join(tempfile.gettempdir(), 'news_scraper_api_endpoints.json'))
+CACHE_TTL_SECONDS = int(os.environ.get('API_ENDPOINT_TTL_SECONDS', 3600))
+PROBE_TIMEOUT_SECONDS = 10
+
+# Candidate paths in order of preference, and how to probe them.
+# Write endpoints are probed with OPTIONS so probing never creates or deletes
+# anything; `allow` is the method the Allow header has to list when present.
+ENDPOINTS = {
+    'health': {'paths': ['/', '/api/', '/health/', '/status/'], 'probe': 'GET', 'accept': (200, 404)},
+    'keywords': {'paths': ['/api/keywords/', '/api/keywords', '/keywords/', '/keywords'], 'probe': 'GET', 'accept': (200,)},
+    'articles': {'paths': ['/api/articles/', '/api/articles', '/articles/', '/articles'], 'probe': 'OPTIONS', 'allow': 'POST'},
+    'cleanup': {'paths': ['/api/articles/cleanup/', '/api/cleanup/', '/api/articles/', '/cleanup/'], 'probe': 'OPTIONS', 'allow': 'DELETE'},
+}
+
+HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': 'NewsMonitor/1.0'
+}
+
+logger = logging.getLogger(__name__)
+
+
+class EndpointResolver:
+    """Resolve logical API endpoints to URLs, with a shared on-disk cache"""
+
+    def __init__(self, api_base_url, cache_file=CACHE_FILE, ttl=CACHE_TTL_SECONDS, timeout=PROBE_TIMEOUT_SECONDS):
+        self.api_base_url = api_base_url.rstrip('/')
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.timeout = timeout
+        self.resolved = {}
+        self.lock = threading.Lock()
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            return cache if isinstance(cache, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Endpoint cache կարդալու սխալ: {e}")
+            return {}
+
+    def _save_cache(self, name, entry):
+        # Merge into what other processes wrote, then replace atomically
+        try:
+            cache = self._load_cache()
+            endpoints = cache.setdefault(self.api_base_url, {})
+            if entry is None:
+                endpoints.pop(name, None)
+            else:
+                endpoints[name] = entry
+            tmp_file = f"{self.cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Endpoint cache պահպանելու սխալ: {e}")
+
+    def _fresh(self, entry):
+        return entry is not None and time.time() - entry.get('resolved_at', 0) < self.ttl
+
+    def _probe(self, spec, url):
+        try:
+            response = requests.request(spec['probe'], url, headers=HEADERS, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return False
+
+        if spec['probe'] != 'OPTIONS':
+            return response.status_code in spec['accept']
+        if response.status_code == 404 or response.status_code >= 500:
+            return False
+        # 405 means the route exists but doesn't answer OPTIONS
+        allow = response.headers.get('Allow')
+        if response.status_code < 300 and allow:
+            return spec['allow'] in [method.strip().upper() for method in allow.split(',')]
+        return True
+
+    def _discover(self, name):
+        spec = ENDPOINTS[name]
+        urls = [f"{self.api_base_url}{path}" for path in spec['paths']]
+        with ThreadPoolExecutor(max_workers=len(urls), thread_name_prefix=f'probe-{name}') as executor:
+            matches = list(executor.map(lambda url: self._probe(spec, url), urls))
+        for url, matched in zip(urls, matches):
+            if matched:
+                return url
+        return None
+
+    def resolve(self, name):
+        """URL of a logical endpoint, or None if no candidate answers"""
+        with self.lock:
+            entry = self.resolved.get(name)
+            if self._fresh(entry):
+                return entry['url']
+
+            entry = self._load_cache().get(self.api_base_url, {}).get(name)
+            if not self._fresh(entry):
+                started = time.time()
+                url = self._discover(name)
+                if url is None:
+                    logger.warning(f"⚠️ '{name}' endpoint չի գտնվել ({time.time() - started:.1f} վրկ)")
+                    return None
+                logger.info(f"🔗 '{name}' endpoint՝ {url} ({time.time() - started:.1f} վրկ)")
+                entry = {'url': url, 'resolved_at': time.time()}
+                self._save_cache(name, entry)
+
+            self.resolved[name] = entry
+            return entry['url']
+
+    def invalidate(self, name):
+        """Forget a resolved endpoint that stopped working, here and on disk"""
+        with self.lock:
+            self.resolved.pop(name, None)
+            self._save_cache(name, None)
+
+
+_resolvers = {}
+_resolvers_lock = threading.Lock()
+
+
+def get_resolver(api_base_url=None):
+    """The process-wide resolver for an API base URL"""
+    api_base_url = (api_base_url or os.environ.get('API_BASE_URL', DEFAULT_API_BASE_URL)).rstrip('/')
+    with _resolvers_lock:
+        if api_base_url not in _resolvers:
+            _resolvers[api_base_url] = EndpointResolver(api_base_url)
+        return _resolvers[api_base_url]
@@ -0,0 +1,277 @@
+# Asyncio browser backend: Chrome DevTools Protocol over a websocket
+#
+# Every Selenium call is a blocking HTTP request to chromedriver made on the
+# reactor thread, so while Chrome loads a page Scrapy can't download, run
+# pipelines or render anything else. The project already runs Twisted on the
+# asyncio reactor (TWISTED_REACTOR in settings.py); AsyncBrowser talks CDP to
+# a pooled Chrome straight from that event loop instead:
+#
+#     html = await get_async_browser(spider).fetch(url, 'article')
+#     page = await get_async_browser(spider).extract(url, selectors)
+#
+# Each page gets its own target (tab), attached with a flat session on one
+# browser-level websocket, so several pages can render while the loop keeps
+# serving Scrapy. The targets live in a browser context of their own, which
+# is disposed with its cookies and cache when the spider closes. RENDER_TABS
+# caps pages in flight and SELENIUM_DOMAIN_DELAY spaces loads on the same
+# domain, as for TabRenderer. Readiness, resource blocking and DOM snapshots
+# reuse the Selenium scripts.
+#
+# The backend needs a browser pool slot (a Chrome with a debugging port);
+# without one, or when BROWSER_BACKEND isn't 'cdp', spiders keep using
+# Selenium.
+
+import json
+import time
+import asyncio
+import itertools
+import urllib.request
+
+import websockets
+
+from news_scraper.browser_pool import get_pool, spider_user_agent
+from news_scraper.dom_snapshot import SNAPSHOT_ATTRIBUTES, SNAPSHOT_SCRIPT, DomSnapshot
+from news_scraper.page_ready import (
+    DEFAULT_READY_TIMEOUT, NETWORK_IDLE_MS, POLL_INTERVAL_SECONDS, READY_SCRIPT, get_politeness, ready_selector
+)
+from news_scraper.resource_blocking import get_blocker
+
+DEFAULT_TABS = 3
+COMMAND_TIMEOUT_SECONDS = 30
+
+
+def _call_script(body, *args):
+    """A Selenium-style script (reads arguments[i]) as a CDP expression"""
+    return f"(function () {{{body}}}).apply(null, {json.dumps(list(args))})"
+
+
+class CDPError(Exception):
+    """A CDP command returned an error"""
+
+
+class CDPConnection:
+    """One browser-level websocket; commands are matched to replies by id"""
+
+    def __init__(self, websocket):
+        self.websocket = websocket
+        self.ids = itertools.count(1)
+        self.pending = {}
+        self.reader = asyncio.ensure_future(self._read())
+
+    @classmethod
+    async def connect(cls, url):
+        # Page HTML comes back in one message
+        return cls(await websockets.connect(url, max_size=None))
+
+    async def _read(self):
+        try:
+            async for message in self.websocket:
+                reply = json.loads(message)
+                future = self.pending.pop(reply.get('id'), None)
+                if future is None or future.done():
+                    # Events; readiness is polled instead
+                    continue
+                if 'error' in reply:
+                    future.set_exception(CDPError(reply['error'].get('message', reply['error'])))
+                else:
+                    future.set_result(reply.get('result', {}))
+        except Exception as e:
+            error = e
+        else:
+            error = ConnectionError("CDP websocket closed")
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self.pending.clear()
+
+    async def send(self, method, params=None, session_id=None, timeout=COMMAND_TIMEOUT_SECONDS):
+        command_id = next(self.ids)
+        message = {'id': command_id, 'method': method, 'params': params or {}}
+        if session_id:
+            message['sessionId'] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self.pending[command_id] = future
+        await self.websocket.send(json.dumps(message))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(command_id, None)
+
+    @property
+    def closed(self):
+        return self.reader.done()
+
+    async def close(self):
+        await self.websocket.close()
+        await asyncio.gather(self.reader, return_exceptions=True)
+
+
+class AsyncPage:
+    """A target (tab) attached through a flat CDP session"""
+
+    def __init__(self, connection, target_id, session_id):
+        self.connection = connection
+        self.target_id = target_id
+        self.session_id = session_id
+
+    async def send(self, method, params=None):
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    async def evaluate(self, script, *args):
+        """Run a Selenium-style script and return its JSON value"""
+        result = await self.send('Runtime.evaluate', {
+            'expression': _call_script(script, *args),
+            'returnByValue': True,
+        })
+        if 'exceptionDetails' in result:
+            raise CDPError(result['exceptionDetails'].get('text', 'script error'))
+        return result.get('result', {}).get('value')
+
+    async def goto(self, url, selector=None, timeout=DEFAULT_READY_TIMEOUT):
+        """Navigate and wait until ready; False if it timed out"""
+        result = await self.send('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise CDPError(f"{result['errorText']}: {url}")
+        deadline = time.time() + timeout
+        while True:
+            try:
+                # The fresh target starts on about:blank, which is "ready" at once
+                if await self.evaluate(f"return location.href !== 'about:blank' && (function () {{{READY_SCRIPT}}})"
+                                       f".apply(null, arguments);", selector, NETWORK_IDLE_MS):
+                    return True
+            except CDPError:
+                # Context replaced mid-evaluation
+                pass
+            if time.time() >= deadline:
+                await self.send('Page.stopLoading')
+                return False
+            await asyncio.sleep(POLL_INTERVAL_SECONDS)
+
+    async def content(self):
+        return await self.evaluate("return document.documentElement.outerHTML;")
+
+    async def snapshot(self, selectors, child_selector=None, attributes=SNAPSHOT_ATTRIBUTES):
+        selectors = list(dict.fromkeys(selectors))
+        return DomSnapshot(await self.evaluate(SNAPSHOT_SCRIPT, selectors, list(attributes), child_selector) or {})
+
+    async def close(self):
+        await self.connection.send('Target.closeTarget', {'targetId': self.target_id})
+
+
+class AsyncBrowser:
+    """Render pages for one spider in a pooled Chrome without blocking the reactor"""
+
+    def __init__(self, spider, tabs=DEFAULT_TABS):
+        self.spider = spider
+        self.tabs = asyncio.Semaphore(max(1, tabs))
+        self.politeness = get_politeness(spider)
+        self.blocker = get_blocker(spider)
+        self.pooled_browser = None
+        self.connection = None
+        self.context_id = None
+        self.starting = asyncio.Lock()
+
+    async def start(self):
+        """Check a browser out of the pool and connect to it (once)"""
+        async with self.starting:
+            if self.connection is not None and not self.connection.closed:
+                return
+            if self.pooled_browser is None:
+                # flock waits and Chrome launch are blocking: keep them off the loop
+                self.pooled_browser = await asyncio.to_thread(get_pool().checkout, attach=False)
+                if self.pooled_browser is None:
+                    raise RuntimeError("no browser pool slot for the CDP backend")
+                self.spider.logger.info(
+                    f"♻️ Browser pool-ից վերցված Chrome CDP-ի համար (slot {self.pooled_browser.slot.index}, "
+                    f"pid {self.pooled_browser.pid})"
+                )
+            address = self.pooled_browser.slot.debugger_address()
+            version = await asyncio.to_thread(self._version, address)
+            self.connection = await CDPConnection.connect(version['webSocketDebuggerUrl'])
+            context = await self.connection.send('Target.createBrowserContext')
+            self.context_id = context['browserContextId']
+
+    @staticmethod
+    def _version(address):
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=5) as response:
+            return json.loads(response.read())
+
+    async def _polite(self, url):
+        # delay_left() and record() run without an await in between, so two
+        # pages for the same domain can't both pass
+        while self.politeness.delay_left(url) > 0:
+            await asyncio.sleep(self.politeness.delay_left(url))
+        self.politeness.record(url)
+
+    async def open_page(self):
+        await self.start()
+        target = await self.connection.send('Target.createTarget',
+                                            {'url': 'about:blank', 'browserContextId': self.context_id})
+        attached = await self.connection.send('Target.attachToTarget',
+                                              {'targetId': target['targetId'], 'flatten': True})
+        page = AsyncPage(self.connection, target['targetId'], attached['sessionId'])
+        # The pooled Chrome's own user agent isn't the spider's
+        user_agent = spider_user_agent(self.spider)
+        if user_agent:
+            await page.send('Network.setUserAgentOverride', {'userAgent': user_agent})
+        if self.blocker.patterns:
+            await page.send('Network.enable')
+            await page.send('Network.setBlockedURLs', {'urls': self.blocker.patterns})
+        return page
+
+    async def _render(self, url, page_type, extract):
+        async with self.tabs:
+            await self._polite(url)
+            page = await self.open_page()
+            try:
+                self.pooled_browser.pages += 1
+                if not await page.goto(url, ready_selector(self.spider.name, page_type)):
+                    self.spider.logger.warning(f"⏰ Page load timeout: {url}")
+                return await extract(page)
+            finally:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+
+    async def fetch(self, url, page_type='article'):
+        """The rendered HTML of url"""
+        self.spider.logger.info(f"🌐 CDP-ով բեռնվում է: {url}")
+        return await self._render(url, page_type, lambda page: page.content())
+
+    async def extract(self, url, selectors, page_type='article', child_selector=None):
+        """A DomSnapshot of selectors on the rendered url"""
+        self.spider.logger.info(f"🌐 CDP-ով բեռնվում է: {url}")
+        return await self._render(url, page_type, lambda page: page.snapshot(selectors, child_selector))
+
+    async def close(self, recycle=False):
+        """Disconnect and give the browser back to the pool"""
+        if self.connection is not None:
+            try:
+                # Targets are closed per page; cookies and cache go with the context
+                await self.connection.send('Target.disposeBrowserContext', {'browserContextId': self.context_id})
+            except Exception:
+                pass
+            await self.connection.close()
+            self.connection = None
+        if self.pooled_browser is not None:
+            browser, self.pooled_browser = self.pooled_browser, None
+            await asyncio.to_thread(get_pool().checkin, browser, recycle)
+
+
+def backend_enabled(spider):
+    """The spider renders through AsyncBrowser rather than Selenium"""
+    settings = getattr(spider, 'settings', None)
+    if settings is None or settings.get('BROWSER_BACKEND', 'selenium') != 'cdp':
+        return False
+    return not spider.__dict__.get('async_browser_failed') and get_pool().enabled
+
+
+def get_async_browser(spider):
+    """The spider's AsyncBrowser, or None when the CDP backend is off"""
+    if not backend_enabled(spider):
+        return None
+    browser = spider.__dict__.get('async_browser')
+    if browser is None:
+        browser = spider.async_browser = AsyncBrowser(spider, spider.settings.getint('RENDER_TABS', DEFAULT_TABS))
+    return browser
@@ -0,0 +1,410 @@
+# Shared pool of warm headless Chrome browsers
+#
+# Each pool slot runs one Chrome with --remote-debugging-port. Chrome is
+# started in its own session, so it keeps running after the spider process
+# that launched it exits, and the next crawl attaches to it instead of paying
+# the browser cold start again. Spiders check a slot out, attach a Selenium
+# driver through debuggerAddress, and check it back in from closed().
+#
+# Slots are shared between spider processes through per-slot lock files
+# (flock, released by the kernel if a spider is killed); the slot state
+# (pid, port, start time, page count) is a JSON file next to each lock.
+# Browsers are health-checked over the DevTools HTTP endpoint before every
+# checkout and recycled when they die or exceed the max age / max pages.
+#
+# Unless BROWSER_POOL_SIZE is set, the pool has one slot per parallel spider
+# worker the monitor can run (default_pool_size). checkout_driver() runs on
+# the reactor thread, so it never waits for a busy slot: the spider starts
+# its own Chrome instead. Only the async CDP backend, which checks out from a
+# worker thread, waits up to BROWSER_POOL_CHECKOUT_TIMEOUT. Pooled Chrome is
+# shared by spiders with different user agents, so each tab gets the
+# spider's USER_AGENT through Network.setUserAgentOverride (apply_user_agent).
+#
+# Like manifest.py, this module must stay importable without Scrapy, so the
+# monitor can warm the pool up and shut it down.
+
+import os
+import json
+import time
+import fcntl
+import shutil
+import signal
+import logging
+import tempfile
+import subprocess
+import urllib.request
+
+import psutil
+
+from news_scraper.page_ready import PAGE_LOAD_STRATEGY
+
+POOL_DIR = os.environ.get('BROWSER_POOL_DIR', os.path.join(tempfile.gettempdir(), 'news_scraper_browser_pool'))
+BASE_PORT = int(os.environ.get('BROWSER_POOL_BASE_PORT', 9300))
+MAX_AGE_SECONDS = int(os.environ.get('BROWSER_POOL_MAX_AGE_SECONDS', 3600))
+MAX_PAGES = int(os.environ.get('BROWSER_POOL_MAX_PAGES', 200))
+CHECKOUT_TIMEOUT_SECONDS = float(os.environ.get('BROWSER_POOL_CHECKOUT_TIMEOUT', 30))
+LAUNCH_TIMEOUT_SECONDS = 20
+
+CHROME_BINARIES = ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome']
+
+CHROME_ARGS = [
+    '--headless=new',
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--window-size=1280,720',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-sync',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+]
+
+logger = logging.getLogger(__name__)
+
+
+def default_pool_size():
+    """One slot per parallel spider worker, the same RSS budget split the monitor uses"""
+    if os.environ.get('MONITOR_PARALLEL_SPIDERS', '0') != '1':
+        return 1
+    budget_mb = int(os.environ.get('SPIDER_RSS_BUDGET_MB', 512))
+    worker_mb = max(1, int(os.environ.get('SPIDER_WORKER_RSS_MB', 250)))
+    return max(1, budget_mb // worker_mb)
+
+
+def pool_size():
+    """BROWSER_POOL_SIZE, or default_pool_size() when it isn't set"""
+    size = os.environ.get('BROWSER_POOL_SIZE')
+    return int(size) if size not in (None, '') else default_pool_size()
+
+
+def spider_user_agent(spider):
+    """The spider's USER_AGENT setting (custom_settings before the crawler is bound)"""
+    settings = getattr(spider, 'settings', None)
+    if settings is not None:
+        return settings.get('USER_AGENT')
+    return (getattr(spider, 'custom_settings', None) or {}).get('USER_AGENT')
+
+
+def apply_user_agent(spider, driver):
+    """Send the spider's user agent from the driver's current tab of a pooled Chrome"""
+    user_agent = spider.__dict__.get('pooled_user_agent')
+    if user_agent and 'pooled_browser' in spider.__dict__:
+        driver.execute_cdp_cmd('Network.setUserAgentOverride', {'userAgent': user_agent})
+
+
+def find_chrome():
+    """Path of the Chrome binary (CHROME_BIN or the first one on PATH), or None"""
+    chrome_bin = os.environ.get('CHROME_BIN')
+    if chrome_bin:
+        return chrome_bin
+    for name in CHROME_BINARIES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+class BrowserSlot:
+    """One pooled Chrome: its port, lock file and persisted state"""
+
+    def __init__(self, pool_dir, index, port):
+        self.index = index
+        self.port = port
+        self.lock_path = os.path.join(pool_dir, f'slot-{index}.lock')
+        self.state_path = os.path.join(pool_dir, f'slot-{index}.json')
+        self.profile_dir = os.path.join(pool_dir, f'profile-{index}')
+        self.lock_file = None
+
+    def try_lock(self):
+        self.lock_file = open(self.lock_path, 'a+')
+        try:
+            fcntl.flock(self.lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self.lock_file.close()
+            self.lock_file = None
+            return False
+
+    def unlock(self):
+        if self.lock_file is not None:
+            fcntl.flock(self.lock_file, fcntl.LOCK_UN)
+            self.lock_file.close()
+            self.lock_file = None
+
+    def read_state(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def write_state(self, state):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def debugger_address(self):
+        return f"127.0.0.1:{self.port}"
+
+    def responds(self, timeout=2):
+        """Health check: the DevTools HTTP endpoint answers"""
+        try:
+            with urllib.request.urlopen(f"http://{self.debugger_address()}/json/version", timeout=timeout) as response:
+                return response.status == 200
+        except Exception:
+            return False
+
+    def pid_alive(self, pid):
+        """The pid is still this slot's Chrome (not a reused pid)"""
+        if not pid:
+            return False
+        try:
+            return f'--remote-debugging-port={self.port}' in psutil.Process(pid).cmdline()
+        except psutil.Error:
+            return False
+
+    def healthy(self, state):
+        return self.pid_alive(state.get('pid')) and self.responds()
+
+    def needs_recycle(self, state, max_age, max_pages):
+        age = time.time() - state.get('started_at', 0)
+        return age > max_age or state.get('pages', 0) >= max_pages
+
+    def launch(self, chrome_bin):
+        """Start Chrome for this slot, detached from the calling process"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        process = subprocess.Popen(
+            [chrome_bin, *CHROME_ARGS, f'--remote-debugging-port={self.port}',
+             f'--user-data-dir={self.profile_dir}', 'about:blank'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+        state = {'pid': process.pid, 'port': self.port, 'started_at': time.time(), 'pages': 0}
+        deadline = time.time() + LAUNCH_TIMEOUT_SECONDS
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Chrome exited with code {process.returncode}")
+            if self.responds(timeout=1):
+                self.write_state(state)
+                logger.info(f"🚀 Browser pool slot {self.index}: Chrome սկսված է (pid {process.pid}, port {self.port})")
+                return state
+            time.sleep(0.2)
+        self.terminate(state)
+        raise RuntimeError(f"Chrome did not open port {self.port} in {LAUNCH_TIMEOUT_SECONDS}s")
+
+    def terminate(self, state):
+        """Kill the slot's Chrome (its whole process group)"""
+        pid = state.get('pid')
+        if self.pid_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self.write_state({})
+
+
+class PooledBrowser:
+    """A checked-out slot with the Selenium driver attached to it"""
+
+    def __init__(self, slot, state, driver):
+        self.slot = slot
+        self.state = state
+        self.driver = driver
+        self.pages = 0
+
+        # Without a driver (async CDP backend) the user counts pages itself
+        if driver is None:
+            return
+
+        # Count navigations for max-pages recycling
+        original_get = driver.get
+
+        def counting_get(url):
+            self.pages += 1
+            return original_get(url)
+
+        driver.get = counting_get
+
+    @property
+    def pid(self):
+        return self.state.get('pid')
+
+
+class BrowserPool:
+    """Check warm Chrome browsers out to spiders and back in"""
+
+    def __init__(self, size=None, pool_dir=POOL_DIR, base_port=BASE_PORT,
+                 max_age=MAX_AGE_SECONDS, max_pages=MAX_PAGES):
+        self.size = pool_size() if size is None else size
+        self.pool_dir = pool_dir
+        self.max_age = max_age
+        self.max_pages = max_pages
+        self.chrome_bin = find_chrome()
+        self.slots = [BrowserSlot(pool_dir, index, base_port + index) for index in range(self.size)]
+        if self.enabled:
+            os.makedirs(pool_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return self.size > 0 and self.chrome_bin is not None
+
+    def _ensure_running(self, slot):
+        """Return a healthy state for a locked slot, relaunching Chrome if needed"""
+        state = slot.read_state()
+        if state and slot.healthy(state) and not slot.needs_recycle(state, self.max_age, self.max_pages):
+            return state
+        if state:
+            logger.info(f"♻️ Browser pool slot {slot.index}: Chrome-ը վերագործարկվում է")
+            slot.terminate(state)
+        return slot.launch(self.chrome_bin)
+
+    def _attach(self, slot):
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        options.debugger_address = slot.debugger_address()
+        options.page_load_strategy = PAGE_LOAD_STRATEGY
+        return webdriver.Chrome(options=options)
+
+    def checkout(self, timeout=CHECKOUT_TIMEOUT_SECONDS, attach=True):
+        """Lock a free slot and attach a driver; None if the pool is off or busy
+
+        Waits up to timeout seconds for a slot; timeout=0 tries each slot once.
+        With attach=False no Selenium driver is started; the caller talks to
+        the browser at slot.debugger_address() directly.
+        """
+        if not self.enabled:
+            return None
+        deadline = time.time() + timeout
+        while True:
+            for slot in self.slots:
+                if not slot.try_lock():
+                    continue
+                try:
+                    state = self._ensure_running(slot)
+                    return PooledBrowser(slot, state, self._attach(slot) if attach else None)
+                except Exception as e:
+                    logger.warning(f"⚠️ Browser pool slot {slot.index} սխալ: {e}")
+                    slot.unlock()
+            if time.time() >= deadline:
+                waited = f" {timeout:.0f} վրկ-ում" if timeout else ""
+                logger.warning(f"⚠️ Browser pool-ում ազատ browser չկա{waited}")
+                return None
+            time.sleep(0.5)
+
+    def reset(self, driver):
+        """Leave one blank tab without cookies or cache for the next checkout"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get('about:blank')
+        driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+
+    def checkin(self, browser, recycle=False):
+        """Reset the browser, detach the driver and unlock the slot"""
+        slot = browser.slot
+        state = browser.state
+        try:
+            if browser.driver is not None:
+                try:
+                    self.reset(browser.driver)
+                except Exception as e:
+                    logger.warning(f"⚠️ Browser reset սխալ, կվերագործարկվի: {e}")
+                    recycle = True
+
+                # Stop only chromedriver: quit() would close the pooled browser's windows
+                try:
+                    browser.driver.service.stop()
+                except Exception:
+                    pass
+
+            state['pages'] = state.get('pages', 0) + browser.pages
+            if recycle or slot.needs_recycle(state, self.max_age, self.max_pages):
+                slot.terminate(state)
+            else:
+                slot.write_state(state)
+        finally:
+            slot.unlock()
+
+    def warm_up(self):
+        """Start (or recycle) every free slot's Chrome ahead of the next crawl"""
+        started = 0
+        for slot in self.slots if self.enabled else []:
+            if not slot.try_lock():
+                continue
+            try:
+                self._ensure_running(slot)
+                started += 1
+            except Exception as e:
+                logger.warning(f"⚠️ Browser pool slot {slot.index} warm-up սխալ: {e}")
+            finally:
+                slot.unlock()
+        return started
+
+    def shutdown(self):
+        """Kill every free slot's Chrome (called when the monitor exits)"""
+        for slot in self.slots if self.enabled else []:
+            if not slot.try_lock():
+                continue
+            try:
+                state = slot.read_state()
+                if state:
+                    slot.terminate(state)
+            finally:
+                slot.unlock()
+
+
+_pool = None
+
+
+def get_pool():
+    """The process-wide pool configured from the BROWSER_POOL_* settings"""
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool()
+    return _pool
+
+
+def checkout_driver(spider, user_agent=None):
+    """Attach spider.driver to a pooled browser
+
+    Called on the reactor thread, so it doesn't wait for a busy slot. Returns
+    the driver, or None when the pool is off, has no Chrome binary, is busy
+    or fails; spiders then start their own Chrome as before. user_agent
+    defaults to the spider's USER_AGENT setting.
+    """
+    try:
+        browser = get_pool().checkout(timeout=0)
+    except Exception as e:
+        spider.logger.warning(f"⚠️ Browser pool checkout սխալ: {e}")
+        return None
+    if browser is None:
+        return None
+    spider.pooled_browser = browser
+    spider.pooled_user_agent = user_agent or spider_user_agent(spider)
+    driver = browser.driver
+    apply_user_agent(spider, driver)
+    spider.logger.info(f"♻️ Browser pool-ից վերցված Chrome (slot {browser.slot.index}, pid {browser.pid})")
+    return driver
+
+
+def checkin_driver(spider, recycle=False):
+    """Give the spider's pooled browser back; False if the driver wasn't pooled"""
+    browser = spider.__dict__.pop('pooled_browser', None)
+    spider.__dict__.pop('pooled_user_agent', None)
+    if browser is None:
+        return False
+    try:
+        get_pool().checkin(browser, recycle=recycle)
+    except Exception as e:
+        spider.logger.warning(f"⚠️ Browser pool checkin սխալ: {e}")
+    return True
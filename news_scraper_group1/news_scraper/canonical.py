@@ -0,0 +1,80 @@
+# Canonical article URLs and the article key built from them
+#
+# Dedup used to key articles on md5(f"{url}:{title}"), with the listing's
+# preview title on the lookup side and the article page's title on the mark
+# side, so the same article got a new key whenever the preview text,
+# whitespace, tracking parameters or http/https differed, and was rendered
+# again. canonical_url() normalizes what doesn't identify an article:
+#
+#   scheme         always https
+#   host           lowercase, without www. and the default port
+#   path           one percent-encoding, duplicate and trailing slashes removed
+#   query          tracking parameters (utm_*, fbclid, ...) dropped, the rest sorted
+#   fragment       dropped
+#
+# Sites with numeric article IDs go further: armenpress.am and news.am are
+# keyed on language + ID, so slug, .html and /news/ vs /article/ variants of
+# one article collapse to one key. article_key() hashes the canonical form;
+# dedup, the pipeline and the API payload all use it.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import re
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, quote, unquote
+
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'yclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid',
+    '_ga', '_gl', 'ref', 'ref_src', 'share', 'amp',
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# Older paths use three-letter language codes for the same sections
+LANGUAGES = {'arm': 'hy', 'am': 'hy', 'hy': 'hy', 'eng': 'en', 'en': 'en', 'rus': 'ru', 'ru': 'ru'}
+
+# host -> (pattern with an optional 'lang' and an 'id' group, language of
+# paths without a language segment)
+SITE_RULES = {
+    'armenpress.am': (re.compile(r'^/(?:(?P<lang>[a-z]{2,3})/)?(?:article|news)/(?P<id>\d+)'), 'hy'),
+    'news.am': (re.compile(r'^/(?:(?P<lang>[a-z]{2,3})/)?news/(?P<id>\d+)'), 'hy'),
+}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url):
+    """https URL with host, path and query normalized and the fragment dropped"""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    # Armenian slugs arrive both raw and percent-encoded
+    path = quote(unquote(parts.path), safe="/:@!$&'()*+,;=-._~")
+    path = re.sub(r'/{2,}', '/', path).rstrip('/')
+    query = urlencode(sorted((name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+                             if not _is_tracking(name)))
+    return urlunsplit(('https', host, path, query, ''))
+
+
+def article_identity(url):
+    """The canonical form an article is known by: site ID where the site has one"""
+    canonical = canonical_url(url)
+    parts = urlsplit(canonical)
+    rule = SITE_RULES.get(parts.hostname)
+    if rule:
+        pattern, default_lang = rule
+        match = pattern.match(parts.path)
+        if match:
+            lang = match.group('lang') or default_lang
+            return f"{parts.hostname}/{LANGUAGES.get(lang, lang)}/{match.group('id')}"
+    return canonical
+
+
+def article_key(url):
+    """Stable key of the article at url"""
+    return hashlib.md5(article_identity(url).encode()).hexdigest()
@@ -0,0 +1,88 @@
+# Per-run time budget for spiders
+#
+# The monitor passes an absolute deadline (epoch seconds) as the `deadline`
+# spider argument (`scrapy crawl <name> -a deadline=...`). Spiders call
+# deadline_near() before starting another article and stop discovering new
+# work once it returns True. SpiderDeadline closes the spider through the
+# engine at the same point, so queued article requests are dropped while the
+# ones already in flight still reach the pipeline and get marked processed.
+
+import time
+import logging
+
+from scrapy import signals
+
+# Seconds before the deadline at which spiders stop taking new articles
+DEFAULT_DRAIN_SECONDS = 20
+
+logger = logging.getLogger(__name__)
+
+
+def get_deadline(spider):
+    """The run's deadline as epoch seconds, or None when the run has no budget"""
+    deadline = getattr(spider, 'deadline', None)
+    if deadline in (None, ''):
+        return None
+    try:
+        return float(deadline)
+    except (TypeError, ValueError):
+        return None
+
+
+def seconds_left(spider):
+    """Seconds until the deadline, or None when the run has no budget"""
+    deadline = get_deadline(spider)
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def drain_seconds(spider):
+    settings = getattr(spider, 'settings', None)
+    if settings is None:
+        return DEFAULT_DRAIN_SECONDS
+    return settings.getfloat('DEADLINE_DRAIN_SECONDS', DEFAULT_DRAIN_SECONDS)
+
+
+def deadline_near(spider):
+    """True once the spider should stop discovering new articles"""
+    left = seconds_left(spider)
+    if left is None or left > drain_seconds(spider):
+        return False
+    if not spider.__dict__.get('deadline_hit'):
+        spider.deadline_hit = True
+        spider.logger.warning(f"⏳ Ժամանակը սպառվում է ({max(left, 0):.0f} վրկ), նոր հոդվածներ չեն վերցվում")
+    return True
+
+
+class SpiderDeadline:
+    """Scrapy extension that closes the spider gracefully when its budget runs out"""
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.delayed_call = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        left = seconds_left(spider)
+        if left is None:
+            return
+        from twisted.internet import reactor
+        self.delayed_call = reactor.callLater(max(0, left - drain_seconds(spider)), self.close_spider, spider)
+
+    def close_spider(self, spider):
+        self.delayed_call = None
+        deadline_near(spider)
+        # Pending requests are dropped, in-progress ones finish and their items are piped
+        self.crawler.engine.close_spider(spider, 'deadline')
+
+    def spider_closed(self, spider):
+        if self.delayed_call is not None and self.delayed_call.active():
+            self.delayed_call.cancel()
+        self.delayed_call = None
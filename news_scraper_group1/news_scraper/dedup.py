@@ -0,0 +1,178 @@
+# Batched "already processed" checks for the spiders
+#
+# Spiders used to call redis exists() once per candidate link and setex()
+# once per processed article, one round trip each. ArticleDedup answers a
+# whole listing page with one pipelined round trip (prefetch) and buffers
+# marks until FLUSH_EVERY of them can be written in one pipeline; the rest
+# are written when the spider closes. is_processed() / mark() keep the
+# per-article API the spiders already use, so only the listing loop has to
+# call prefetch() first.
+#
+# Articles are keyed on canonical.article_key(url), so the listing link and
+# the article page's URL find the same entry whatever the titles say. A
+# redirected article is marked under both the link the listing gave
+# (requested_url) and the URL it ended up at.
+#
+# Without Redis the same calls go to a local store, so dedup keeps working
+# across runs and monitor restarts. DEDUP_BACKEND picks the store:
+#
+#   auto    Redis if connected, else SQLite (seen_store.py) (default)
+#   redis   Redis only
+#   sqlite  SQLite even when Redis is up
+#   bloom   Bloom filter files (seen_filter.py) instead of both, for disks
+#           where SQLite's WAL locking doesn't work (network filesystems)
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import os
+import logging
+
+from news_scraper.canonical import article_key, canonical_url
+from news_scraper.seen_filter import open_seen_filter
+from news_scraper.seen_store import open_seen_store, content_hash, keyword_set_version
+
+# Processed articles are remembered for 7 days
+TTL_SECONDS = 7 * 24 * 3600
+FLUSH_EVERY = 10
+BACKEND = os.environ.get('DEDUP_BACKEND', 'auto')
+
+logger = logging.getLogger(__name__)
+
+
+def requested_url(response):
+    """The URL the spider asked for, before redirects (the listing link)"""
+    request = getattr(response, 'request', None)
+    if request is None:
+        return response.url
+    return request.meta.get('redirect_urls', [request.url])[0]
+
+
+class ArticleDedup:
+    """Processed-article cache for one site, with batched Redis round trips"""
+
+    def __init__(self, redis_client, site, ttl=TTL_SECONDS, flush_every=FLUSH_EVERY, backend=BACKEND):
+        self.redis_client = redis_client if backend in ('auto', 'redis') else None
+        self.store = self.local = None
+        if not self.redis_client and backend in ('auto', 'sqlite'):
+            self.store = open_seen_store(ttl)
+            if self.store:
+                logger.info(f"💽 {site}: dedup-ը SQLite-ում ({self.store.path})")
+        if backend == 'bloom':
+            self.local = open_seen_filter(site, ttl)
+            if self.local:
+                logger.info(f"💽 {site}: dedup-ը տեղական Bloom ֆայլերով")
+        self.site = site
+        self.keyword_version = None
+        self.prefix = f"processed_{site}:"
+        self.ttl = ttl
+        self.flush_every = flush_every
+        # Answers already known in this run: prefetched, looked up or marked
+        self.known = {}
+        self.pending = []
+        self.round_trips = 0
+        self.write_failed = False
+
+    @property
+    def enabled(self):
+        return bool(self.redis_client or self.store or self.local)
+
+    def set_keywords(self, keywords):
+        """Keyword set that marked articles were matched against"""
+        self.keyword_version = keyword_set_version(keywords)
+
+    def key(self, url):
+        return self.prefix + article_key(url)
+
+    def covers(self, urls):
+        """Every url was a cache hit or marked in this run, and the marks were written"""
+        # known stays empty without a backend, and survives close()
+        return not self.write_failed and all(self.known.get(self.key(url)) for url in urls)
+
+    def _exists(self, keys):
+        """One bool per key, in one round trip"""
+        if self.store:
+            return self.store.contains_many(keys)
+        if self.local:
+            return [self.local.contains(key) for key in keys]
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.exists(key)
+        results = pipe.execute()
+        self.round_trips += 1
+        return results
+
+    def _store(self, records):
+        if self.store:
+            self.store.add_many(self.site, records, self.keyword_version)
+            return
+        keys = [key for key, _, _ in records]
+        if self.local:
+            self.local.add_many(keys)
+            return
+        pipe = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.setex(key, self.ttl, "1")
+        pipe.execute()
+        self.round_trips += 1
+
+    def prefetch(self, urls):
+        """Look up article URLs in one round trip; later checks hit memory"""
+        if not self.enabled:
+            return
+        keys = [key for key in dict.fromkeys(self.key(url) for url in urls)
+                if key not in self.known]
+        if not keys:
+            return
+        try:
+            results = self._exists(keys)
+        except Exception as e:
+            logger.warning(f"⚠️ Dedup prefetch սխալ: {e}")
+            return
+        for key, exists in zip(keys, results):
+            self.known[key] = bool(exists)
+
+    def is_processed(self, url):
+        if not self.enabled:
+            return False
+        key = self.key(url)
+        if key not in self.known:
+            try:
+                self.known[key] = bool(self._exists([key])[0])
+            except Exception as e:
+                logger.warning(f"⚠️ Dedup lookup սխալ: {e}")
+                return False
+        return self.known[key]
+
+    def mark(self, url, content=None, original_url=None):
+        """Remember an article, also under original_url if it was redirected; written with the next flush"""
+        if not self.enabled:
+            return
+        digest = content_hash(content)
+        # Both URLs often share one key
+        urls = {self.key(marked_url): marked_url for marked_url in (original_url, url) if marked_url}
+        for key, marked_url in urls.items():
+            self.known[key] = True
+            self.pending.append((key, canonical_url(marked_url), digest))
+        if len(self.pending) >= self.flush_every:
+            self.flush()
+
+    def close(self):
+        """Flush buffered marks and release the local files"""
+        self.flush()
+        if self.store:
+            self.store.close()
+            self.store = None
+        if self.local:
+            self.local.close()
+            self.local = None
+
+    def flush(self):
+        """Write buffered marks in one pipelined round trip"""
+        if not self.pending or not self.enabled:
+            return
+        records, self.pending = self.pending, []
+        try:
+            self._store(records)
+        except Exception as e:
+            self.write_failed = True
+            logger.warning(f"⚠️ Dedup-ում {len(records)} հոդված չգրանցվեց: {e}")
@@ -0,0 +1,82 @@
+# One-round-trip DOM extraction for the Selenium spiders
+#
+# Every find_element(), .text and get_attribute() call on a WebElement is a
+# separate HTTP request to chromedriver; extracting one article that way costs
+# dozens to hundreds of round trips. take_snapshot() runs a single
+# execute_script that collects the text and attributes of every element
+# matching the given selectors and returns them as one JSON blob. DomSnapshot
+# answers find_element()/find_elements() from that blob with elements that
+# have the same .text / get_attribute() API, so extraction code only swaps
+# `self.driver` for the snapshot.
+
+SNAPSHOT_ATTRIBUTES = ['href', 'title', 'aria-label', 'content']
+
+SNAPSHOT_SCRIPT = """
+var selectors = arguments[0], attributes = arguments[1], childSelector = arguments[2];
+function text(el) {
+    return (el.innerText || el.textContent || '').trim();
+}
+function describe(el) {
+    var item = {text: text(el), attrs: {}};
+    attributes.forEach(function (name) {
+        var value = el.getAttribute(name);
+        if (value !== null) item.attrs[name] = value;
+    });
+    // Resolved URL, like WebElement.get_attribute('href')
+    if (typeof el.href === 'string') item.attrs.href = el.href;
+    if (childSelector) {
+        item.children = Array.prototype.map.call(el.querySelectorAll(childSelector), text);
+    }
+    return item;
+}
+var result = {};
+selectors.forEach(function (selector) {
+    try {
+        result[selector] = Array.prototype.map.call(document.querySelectorAll(selector), describe);
+    } catch (e) {
+        result[selector] = [];
+    }
+});
+return result;
+"""
+
+
+class SnapshotElement:
+    """An element captured by take_snapshot(), with the WebElement read API"""
+
+    def __init__(self, item):
+        self.text = item.get('text') or ''
+        self.attrs = item.get('attrs') or {}
+        self.children = item.get('children') or []
+
+    def get_attribute(self, name):
+        return self.attrs.get(name)
+
+    def find_elements(self, by, selector):
+        """The captured child_selector matches (the selector itself isn't re-run)"""
+        return [SnapshotElement({'text': child}) for child in self.children]
+
+
+class DomSnapshot:
+    """The elements matching a fixed set of selectors, captured at one moment"""
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def find_elements(self, by, selector):
+        # Tag names are valid CSS selectors, so `by` doesn't change the lookup.
+        # Selectors that weren't captured raise KeyError.
+        return [SnapshotElement(item) for item in self.elements[selector]]
+
+    def find_element(self, by, selector):
+        elements = self.find_elements(by, selector)
+        if not elements:
+            raise LookupError(f"No element matches {selector!r}")
+        return elements[0]
+
+
+def take_snapshot(driver, selectors, child_selector=None, attributes=SNAPSHOT_ATTRIBUTES):
+    """Capture text and attributes of all elements matching `selectors` in one call"""
+    selectors = list(dict.fromkeys(selectors))
+    elements = driver.execute_script(SNAPSHOT_SCRIPT, selectors, list(attributes), child_selector)
+    return DomSnapshot(elements or {})
@@ -0,0 +1,156 @@
+# Memory-driven recycling of the Selenium browser
+#
+# Spiders used to restart Chrome after a fixed 20 articles and logged only
+# the Python process RSS, which misses the Chrome renderer processes where
+# the memory actually goes. DriverMemoryGovernor samples the combined RSS of
+# the browser's process tree after every rendered page and asks for a
+# recycle only when
+#   - the tree is above DRIVER_MAX_RSS_MB, or
+#   - it keeps growing by more than DRIVER_MAX_GROWTH_MB_PER_PAGE per page
+#     over the last DRIVER_GROWTH_WINDOW pages (a leak), once the browser is
+#     past its warm-up pages.
+# Healthy browsers are no longer restarted on a schedule.
+#
+# The samples go to the crawl stats (browser/rss_mb, browser/peak_rss_mb,
+# browser/recycles/<reason>) and into the run summary, so the monitor sees
+# the browser's memory next to the spider's own peak RSS.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+from collections import deque
+
+import psutil
+
+DEFAULT_MAX_RSS_MB = 700
+DEFAULT_MAX_GROWTH_MB_PER_PAGE = 15
+DEFAULT_GROWTH_WINDOW = 5
+# First pages fill caches and JIT memory; growth there isn't a leak
+WARMUP_PAGES = 3
+# Samples kept for the run summary
+MAX_EXPORTED_SAMPLES = 100
+
+
+def browser_pid(spider):
+    """Root pid of the spider's browser: the pooled Chrome or its chromedriver"""
+    browser = getattr(spider, 'pooled_browser', None)
+    if browser is not None and browser.pid:
+        return browser.pid
+    try:
+        return spider.driver.service.process.pid
+    except Exception:
+        return None
+
+
+def process_tree_rss_mb(pid):
+    """RSS of a process and all its descendants, in MB"""
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+    except psutil.Error:
+        return None
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            # Renderer exited between listing and sampling
+            pass
+    return total / 1024 / 1024
+
+
+class DriverMemoryGovernor:
+    """Decide from browser memory samples when to recycle the driver"""
+
+    def __init__(self, max_rss_mb=DEFAULT_MAX_RSS_MB, max_growth_mb_per_page=DEFAULT_MAX_GROWTH_MB_PER_PAGE,
+                 growth_window=DEFAULT_GROWTH_WINDOW):
+        self.max_rss_mb = max_rss_mb
+        self.max_growth_mb_per_page = max_growth_mb_per_page
+        self.growth_window = max(1, growth_window)
+        self.samples = []
+        self.peak_rss_mb = 0
+        self.recycles = 0
+        self.reset()
+
+    def reset(self):
+        """Start over after the browser was recycled"""
+        self.pages = 0
+        self.window = deque(maxlen=self.growth_window + 1)
+
+    def record(self, rss_mb):
+        """Add a sample taken after one more page"""
+        self.pages += 1
+        self.window.append(rss_mb)
+        self.peak_rss_mb = max(self.peak_rss_mb, rss_mb)
+        self.samples.append([self.pages, round(rss_mb, 1)])
+        del self.samples[:-MAX_EXPORTED_SAMPLES]
+
+    def growth_per_page(self):
+        if len(self.window) <= self.growth_window:
+            return None
+        return (self.window[-1] - self.window[0]) / self.growth_window
+
+    def recycle_reason(self):
+        """'threshold', 'growth' or None for the latest sample"""
+        if not self.window:
+            return None
+        if self.window[-1] >= self.max_rss_mb:
+            return 'threshold'
+        growth = self.growth_per_page()
+        if self.pages > WARMUP_PAGES + self.growth_window and growth is not None \
+                and growth > self.max_growth_mb_per_page:
+            return 'growth'
+        return None
+
+
+def get_governor(spider):
+    """The spider's governor, configured from the DRIVER_* settings"""
+    governor = spider.__dict__.get('memory_governor')
+    if governor is None:
+        settings = getattr(spider, 'settings', None)
+        if settings is not None:
+            governor = DriverMemoryGovernor(
+                settings.getfloat('DRIVER_MAX_RSS_MB', DEFAULT_MAX_RSS_MB),
+                settings.getfloat('DRIVER_MAX_GROWTH_MB_PER_PAGE', DEFAULT_MAX_GROWTH_MB_PER_PAGE),
+                settings.getint('DRIVER_GROWTH_WINDOW', DEFAULT_GROWTH_WINDOW),
+            )
+        else:
+            governor = DriverMemoryGovernor()
+        spider.memory_governor = governor
+    return governor
+
+
+def browser_rss_mb(spider):
+    """Current RSS of the spider's browser process tree, or None without one"""
+    if not getattr(spider, 'driver', None):
+        return None
+    pid = browser_pid(spider)
+    return process_tree_rss_mb(pid) if pid else None
+
+
+def driver_needs_recycle(spider):
+    """Sample the browser after a rendered page; True when it should be recycled"""
+    rss_mb = browser_rss_mb(spider)
+    if rss_mb is None:
+        return False
+    governor = get_governor(spider)
+    governor.record(rss_mb)
+
+    stats = getattr(getattr(spider, 'crawler', None), 'stats', None)
+    if stats is not None:
+        stats.set_value('browser/rss_mb', round(rss_mb, 1), spider=spider)
+        stats.max_value('browser/peak_rss_mb', round(rss_mb, 1), spider=spider)
+
+    reason = governor.recycle_reason()
+    if reason is None:
+        return False
+    if reason == 'threshold':
+        spider.logger.info(f"🔄 Browser-ի հիշողությունը {rss_mb:.0f} MB է (սահման՝ {governor.max_rss_mb:.0f} MB), "
+                           f"վերագործարկում {governor.pages} էջից հետո")
+    else:
+        spider.logger.warning(f"🔄 Browser-ի հիշողությունը աճում է {governor.growth_per_page():.1f} MB/էջ, "
+                              f"հնարավոր leak, վերագործարկում ({rss_mb:.0f} MB)")
+    if stats is not None:
+        stats.inc_value(f'browser/recycles/{reason}', spider=spider)
+    governor.recycles += 1
+    governor.reset()
+    return True
@@ -0,0 +1,150 @@
+# HTTP-first fetching with a remembered browser fallback
+#
+# Requests marked with meta['selenium'] are fetched over plain HTTP first.
+# When a callback's extraction comes back empty (listing) or too short
+# (article), the page is requested again with meta['render'] and
+# SeleniumRenderMiddleware loads it in Chrome. If the rendered copy extracts
+# fine, that site needs JS for that page type and its next pages go straight
+# to the browser; a page that parses over HTTP marks the page type as HTTP.
+#
+# Decisions are shared between spider processes through a small JSON file.
+# Browser decisions expire after FETCH_STRATEGY_TTL_SECONDS, so a site that
+# starts serving its HTML server-side is tried over HTTP again.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+
+STATE_FILE = os.environ.get('FETCH_STRATEGY_FILE',
+                            os.path.join(tempfile.gettempdir(), 'news_scraper_fetch_strategy.json'))
+BROWSER_TTL_SECONDS = int(os.environ.get('FETCH_STRATEGY_TTL_SECONDS', 86400))
+
+HTTP = 'http'
+BROWSER = 'browser'
+
+logger = logging.getLogger(__name__)
+
+
+class FetchStrategy:
+    """Remember per site and page type whether pages need the browser"""
+
+    def __init__(self, state_file=STATE_FILE, browser_ttl=BROWSER_TTL_SECONDS):
+        self.state_file = state_file
+        self.browser_ttl = browser_ttl
+        self.lock = threading.Lock()
+        self.decisions = self._load()
+
+    def _load(self):
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"⚠️ Fetch strategy ֆայլը կարդալու սխալ: {e}")
+            return {}
+
+    def _save(self, site, page_type, entry):
+        # Merge into what other spiders wrote, then replace atomically
+        try:
+            state = self._load()
+            state.setdefault(site, {})[page_type] = entry
+            tmp_file = f"{self.state_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            logger.warning(f"⚠️ Fetch strategy պահպանելու սխալ: {e}")
+
+    def _fresh(self, entry):
+        return time.time() - entry.get('decided_at', 0) < self.browser_ttl
+
+    def mode(self, site, page_type):
+        """HTTP or BROWSER for the next page of this type"""
+        with self.lock:
+            entry = self.decisions.get(site, {}).get(page_type)
+        if entry and entry.get('mode') == BROWSER and self._fresh(entry):
+            return BROWSER
+        return HTTP
+
+    def record(self, site, page_type, mode):
+        """Remember a decision; only changes are written to disk"""
+        with self.lock:
+            entry = self.decisions.setdefault(site, {}).get(page_type)
+            if entry and entry.get('mode') == mode and (mode == HTTP or self._fresh(entry)):
+                return
+            entry = {'mode': mode, 'decided_at': time.time()}
+            self.decisions[site][page_type] = entry
+            self._save(site, page_type, entry)
+        logger.info(f"🧭 {site} {page_type} էջերը՝ {mode}")
+
+
+_strategy = None
+
+
+def get_strategy():
+    """The process-wide strategy backed by FETCH_STRATEGY_FILE"""
+    global _strategy
+    if _strategy is None:
+        _strategy = FetchStrategy()
+    return _strategy
+
+
+def page_type(request):
+    return request.meta.get('page_type', 'article')
+
+
+def wants_browser(request, spider):
+    """Render this request in Chrome instead of downloading it over HTTP"""
+    if request.meta.get('render'):
+        return True
+    return get_strategy().mode(spider.name, page_type(request)) == BROWSER
+
+
+def ensure_driver(spider):
+    """Start the spider's browser on first use; False if it can't be started"""
+    if getattr(spider, 'driver', None):
+        return True
+    if getattr(spider, 'driver_failed', False):
+        return False
+    spider.setup_selenium()
+    if not spider.driver:
+        spider.driver_failed = True
+    return bool(spider.driver)
+
+
+def can_render(spider):
+    """A browser is available: the async CDP backend, or Selenium started on first use"""
+    from news_scraper.async_browser import backend_enabled
+
+    return backend_enabled(spider) or ensure_driver(spider)
+
+
+def browser_fallback(spider, response):
+    """The same request for the browser after HTTP extraction came up short
+
+    Returns None when the response was already rendered or no browser can be
+    started; the callback then goes on with what it has.
+    """
+    if response.meta.get('rendered') or not can_render(spider):
+        return None
+    spider.logger.info(f"🌐 HTTP-ով բավարար տվյալ չկա, կբեռնվի Selenium-ով: {response.url}")
+    spider.crawler.stats.inc_value(f'fetch/{page_type(response)}/fallback', spider=spider)
+    return response.request.replace(
+        dont_filter=True,
+        meta=dict(response.meta, render=True, http_fallback=True)
+    )
+
+
+def extraction_succeeded(spider, response):
+    """Record how this page type was fetched successfully"""
+    if not response.meta.get('rendered'):
+        get_strategy().record(spider.name, page_type(response), HTTP)
+    elif response.meta.get('http_fallback'):
+        get_strategy().record(spider.name, page_type(response), BROWSER)
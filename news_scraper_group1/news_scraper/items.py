@@ -13,3 +13,5 @@ class NewsScraperItem(scrapy.Item):
     source_url = scrapy.Field()
     content = scrapy.Field()
     scraped_time = scrapy.Field()
+    # canonical.article_key(link); filled in by the pipeline when missing
+    article_key = scrapy.Field()
@@ -0,0 +1,103 @@
+# Skip the article phase when a site's listing hasn't changed
+#
+# Every cycle each spider loads its listing, takes up to 10 links and checks
+# each one against the dedup cache. In quiet periods the listing shows the
+# same articles as last cycle and all of that finds nothing new. The spiders
+# pass the ordered links they extracted to listing_unchanged(), which
+# compares a fingerprint of their article keys (canonical.py) with the one
+# from the last completed run; on a match the spider yields no article
+# requests and the run's stats get listing/unchanged.
+#
+# A new fingerprint is only saved when the run finished normally, logged no
+# errors and every link of the listing was either already in the dedup cache
+# or marked processed during the run (ArticleDedup.covers). Links left
+# unvisited by a deadline, a failed download, a render timeout or a crash
+# are looked at again next cycle. The links of an unchanged listing count as
+# cached skips, so the adaptive scheduler sees a zero-churn run.
+#
+# Fingerprints are shared between spider processes through a small JSON file,
+# the same way as fetch_strategy.py.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+
+from news_scraper.canonical import article_key
+
+# Stats that mean some request of the run may have been lost
+ERROR_STATS = ('log_count/ERROR', 'downloader/exception_count', 'spider_exceptions/count')
+
+STATE_FILE = os.environ.get('LISTING_STATE_FILE',
+                            os.path.join(tempfile.gettempdir(), 'news_scraper_listings.json'))
+
+logger = logging.getLogger(__name__)
+
+
+def listing_fingerprint(urls):
+    """Same value for the same articles in the same order"""
+    return hashlib.sha1('\n'.join(article_key(url) for url in urls).encode()).hexdigest()
+
+
+def _load(state_file):
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        return state if isinstance(state, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"⚠️ Listing state ֆայլը կարդալու սխալ: {e}")
+        return {}
+
+
+def listing_unchanged(spider, listing_url, urls, state_file=STATE_FILE):
+    """True when listing_url shows the same links as at the end of the last completed run"""
+    urls = list(urls)
+    if not urls:
+        return False
+    fingerprint = listing_fingerprint(urls)
+    previous = _load(state_file).get(spider.name, {}).get(listing_url, {})
+    if previous.get('fingerprint') != fingerprint:
+        # Saved by save_listing_fingerprints() if this run gets through all of them
+        spider.__dict__.setdefault('listing_fingerprints', {})[listing_url] = (fingerprint, urls)
+        return False
+    # A zero-churn sample for the scheduler, same as finding them all cached
+    spider.cached_skips = getattr(spider, 'cached_skips', 0) + len(urls)
+    stats = getattr(getattr(spider, 'crawler', None), 'stats', None)
+    if stats is not None:
+        stats.inc_value('listing/unchanged', spider=spider)
+    spider.logger.info(f"💤 Ցանկը չի փոխվել ({len(urls)} հղում), հոդվածները չեն ստուգվում: {listing_url}")
+    return True
+
+
+def save_listing_fingerprints(spider, reason, state_file=STATE_FILE):
+    """Remember this run's listings; call from closed()"""
+    fingerprints = spider.__dict__.pop('listing_fingerprints', None)
+    if not fingerprints or reason != 'finished' or spider.__dict__.get('deadline_hit'):
+        return
+    stats = getattr(getattr(spider, 'crawler', None), 'stats', None)
+    if stats is not None and any(stats.get_value(name, 0) for name in ERROR_STATS):
+        spider.logger.info("💤 Գործարկումում սխալներ կային, ցանկերի fingerprint-ը չի պահպանվում")
+        return
+    dedup = getattr(spider, 'dedup', None)
+    complete = {listing_url: fingerprint for listing_url, (fingerprint, urls) in fingerprints.items()
+                if dedup is not None and dedup.covers(urls)}
+    if not complete:
+        return
+    # Merge into what other spiders wrote, then replace atomically
+    try:
+        state = _load(state_file)
+        site = state.setdefault(spider.name, {})
+        for listing_url, fingerprint in complete.items():
+            site[listing_url] = {'fingerprint': fingerprint, 'seen_at': time.time()}
+        tmp_file = f"{state_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_file, state_file)
+    except Exception as e:
+        logger.warning(f"⚠️ Listing state պահպանելու սխալ: {e}")
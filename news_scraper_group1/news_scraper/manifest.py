@@ -0,0 +1,106 @@
+# Precompiled spider manifest
+#
+# spider_manifest.json lists every spider with the metadata the monitor needs,
+# so the monitor doesn't have to scan and regex the spider files on startup.
+# Regenerate it with (from news_scraper_group1/):
+#
+#     python -m news_scraper.manifest
+#
+# This module must stay importable without Scrapy: the monitor only imports
+# Scrapy (through build_manifest) when the manifest is missing or stale.
+
+import os
+import sys
+import json
+import hashlib
+from datetime import datetime
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SPIDERS_DIR = os.path.join(PROJECT_DIR, 'news_scraper', 'spiders')
+MANIFEST_PATH = os.path.join(PROJECT_DIR, 'spider_manifest.json')
+
+# Defaults for spiders that don't set the matching class attributes
+# (no default cadence means the monitor's global MONITOR_INTERVAL_MINUTES)
+DEFAULT_INTERVAL_MINUTES = None
+DEFAULT_TIMEOUT_SECONDS = 120
+
+
+def spiders_fingerprint(spiders_dir=SPIDERS_DIR):
+    """Cheap fingerprint of the spiders package: file names and sizes, no reads"""
+    entries = []
+    with os.scandir(spiders_dir) as it:
+        for entry in it:
+            if entry.name.endswith('.py') and entry.name != '__init__.py':
+                entries.append(f"{entry.name}:{entry.stat().st_size}")
+    return hashlib.sha1('\n'.join(sorted(entries)).encode()).hexdigest()
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the manifest, or return None if it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"⚠️ Spider manifest կարդալու սխալ: {e}")
+        return None
+
+
+def is_stale(manifest, spiders_dir=SPIDERS_DIR):
+    """A manifest is stale when spider files were added, removed or changed"""
+    if not manifest or not manifest.get('spiders'):
+        return True
+    return manifest.get('fingerprint') != spiders_fingerprint(spiders_dir)
+
+
+def _spider_entry(spidercls):
+    module = sys.modules.get(spidercls.__module__)
+    needs_browser = getattr(spidercls, 'needs_browser', None)
+    if needs_browser is None:
+        # Every spider that imports Selenium's webdriver drives a browser
+        needs_browser = module is not None and hasattr(module, 'webdriver')
+
+    allowed_domains = getattr(spidercls, 'allowed_domains', None) or []
+    return {
+        'module': spidercls.__module__,
+        'class': spidercls.__name__,
+        'domain': allowed_domains[0] if allowed_domains else None,
+        'start_urls': list(getattr(spidercls, 'start_urls', []) or []),
+        'needs_browser': bool(needs_browser),
+        'default_interval_minutes': getattr(spidercls, 'default_interval_minutes', DEFAULT_INTERVAL_MINUTES),
+        'timeout_seconds': getattr(spidercls, 'timeout_seconds', DEFAULT_TIMEOUT_SECONDS),
+    }
+
+
+def build_manifest():
+    """Build the manifest from Scrapy's SPIDER_MODULES loader"""
+    from scrapy.spiderloader import SpiderLoader
+    from scrapy.utils.project import get_project_settings
+
+    loader = SpiderLoader.from_settings(get_project_settings())
+    spiders = {}
+    for name in sorted(loader.list()):
+        spiders[name] = _spider_entry(loader.load(name))
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': spiders_fingerprint(),
+        'spiders': spiders,
+    }
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    os.environ.setdefault('SCRAPY_SETTINGS_MODULE', 'news_scraper.settings')
+    manifest = build_manifest()
+    write_manifest(manifest)
+    print(f"✅ Spider manifest գրվեց՝ {MANIFEST_PATH} ({', '.join(manifest['spiders'])})")
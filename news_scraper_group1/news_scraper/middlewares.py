@@ -4,6 +4,13 @@
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
 from scrapy import signals
+from scrapy.exceptions import IgnoreRequest
+from scrapy.http import HtmlResponse
+
+from scrapy.utils.defer import deferred_from_coro
+
+from news_scraper.async_browser import CDPError, get_async_browser
+from news_scraper.fetch_strategy import can_render, ensure_driver, page_type, wants_browser
 
 # useful for handling different item types with a single interface
 from itemadapter import ItemAdapter
@@ -98,3 +105,69 @@ class NewsScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+class SeleniumRenderMiddleware:
+    """Fetch requests marked with meta['selenium'] over HTTP or in the browser
+
+    Marked requests are downloaded over plain HTTP unless fetch_strategy says
+    the site needs JS for that page type or the callback asked for a browser
+    retry (meta['render']); those are answered straight from the browser, so
+    a page is never downloaded and then loaded again. It is ordered after
+    Scrapy's built-in downloader middlewares, so the scheduler, dupefilter and
+    DownloaderStats still see every request.
+
+    With BROWSER_BACKEND = 'cdp' pages render through async_browser on the
+    reactor's event loop; otherwise (or if that backend can't start) through
+    the spider's blocking Selenium driver.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        middleware = cls(crawler.stats)
+        crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
+        return middleware
+
+    async def process_request(self, request, spider):
+        if not request.meta.get('selenium'):
+            return None
+
+        if not wants_browser(request, spider) or not can_render(spider):
+            self.stats.inc_value(f'fetch/{page_type(request)}/http', spider=spider)
+            return None
+
+        html_content = await self._render(request, spider)
+        if not html_content:
+            spider.logger.error(f"❌ Selenium չկարողացավ բեռնել: {request.url}")
+            self.stats.inc_value(f'fetch/{page_type(request)}/browser_failed', spider=spider)
+            raise IgnoreRequest(f"Selenium render failed: {request.url}")
+
+        self.stats.inc_value(f'fetch/{page_type(request)}/browser', spider=spider)
+        request.meta['rendered'] = True
+        return HtmlResponse(url=request.url, body=html_content, encoding='utf-8', request=request)
+
+    async def _render(self, request, spider):
+        browser = get_async_browser(spider)
+        if browser is not None:
+            try:
+                return await browser.fetch(request.url, page_type(request))
+            except CDPError as e:
+                # The page failed, not the backend
+                spider.logger.warning(f"⚠️ CDP render սխալ: {e}")
+                return None
+            except Exception as e:
+                spider.logger.warning(f"⚠️ CDP backend-ը չաշխատեց, անցում Selenium-ի: {e}")
+                spider.async_browser_failed = True
+                await browser.close(recycle=True)
+
+        if not ensure_driver(spider):
+            return None
+        return spider.get_page_with_selenium(request.url, page_type(request))
+
+    def spider_closed(self, spider):
+        browser = spider.__dict__.pop('async_browser', None)
+        if browser is not None:
+            return deferred_from_coro(browser.close())
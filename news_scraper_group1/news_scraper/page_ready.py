@@ -0,0 +1,122 @@
+# Readiness-based waits for Selenium page loads
+#
+# Instead of sleeping a fixed 2-5 s after every navigation, spiders wait
+# until the page is usable: the site's listing or article container is in the
+# DOM, or, when that selector no longer matches, the document has loaded and
+# no resource has finished for NETWORK_IDLE_MS. Drivers use the "eager" page
+# load strategy, so driver.get() returns at DOMContentLoaded and the rest of
+# the wait is this check.
+#
+# Politeness is kept separate: DomainPoliteness spaces navigations to the same
+# domain by SELENIUM_DOMAIN_DELAY seconds, whatever the render wait was.
+
+import time
+from urllib.parse import urlparse
+
+from news_scraper.resource_blocking import report_savings
+
+PAGE_LOAD_STRATEGY = 'eager'
+DEFAULT_READY_TIMEOUT = 10
+DEFAULT_DOMAIN_DELAY = 2.0
+NETWORK_IDLE_MS = 500
+POLL_INTERVAL_SECONDS = 0.1
+
+# Set on the old document right before a script-driven navigation; the new
+# document doesn't have it, so a page that is still unloading isn't "ready"
+PENDING_MARKER = '__pageLoadPending'
+
+# Per site and page type: a selector that is only present once the content
+# the spider extracts has been rendered
+READY_SELECTORS = {
+    'armenpress': {'listing': 'div.medium-article-list div.item', 'article': 'div.entry-content p, .post-content p'},
+    'armday': {'listing': 'div.medium-article-list div.item', 'article': 'div.entry-content p, .post-content p'},
+    'aysor': {'listing': 'div.news_feed div.news_block', 'article': 'div.article_content, .news_content'},
+    'hraparak': {'listing': 'ul.recommended-posts li, div.medium-article-list div.item', 'article': 'div.entry-content p, .post-content p'},
+    'panarmenian': {'listing': 'div.widget_items div.witem_cont', 'article': 'div.entry-content p, .post-content p'},
+    'tert': {'listing': "a[href*='/am/news/']", 'article': 'div.post-content p, div.entry-content p'},
+    'newsam': {'listing': "a.news-item, a[href*='/arm/news/']", 'article': 'div.article-content p, div.content p'},
+    'panorama': {'listing': "div.news_block a, a[href*='/news/']", 'article': 'div.post-content p, div.entry-content p'},
+}
+
+READY_SCRIPT = f"""
+var selector = arguments[0], idleMs = arguments[1];
+if (window.{PENDING_MARKER} === true || document.readyState === 'loading') return false;
+if (selector && document.querySelector(selector)) return true;
+if (document.readyState !== 'complete') return false;
+var lastResponse = 0;
+performance.getEntriesByType('resource').forEach(function (entry) {{
+    lastResponse = Math.max(lastResponse, entry.responseEnd);
+}});
+return performance.now() - lastResponse >= idleMs;
+"""
+
+
+def ready_selector(spider_name, page_type):
+    return READY_SELECTORS.get(spider_name, {}).get(page_type)
+
+
+def is_ready(driver, selector=None, idle_ms=NETWORK_IDLE_MS):
+    """One non-blocking readiness check of the driver's current tab"""
+    try:
+        return bool(driver.execute_script(READY_SCRIPT, selector, idle_ms))
+    except Exception:
+        # The document is being replaced
+        return False
+
+
+def wait_until_ready(driver, selector=None, timeout=DEFAULT_READY_TIMEOUT):
+    """Block until the current tab is ready; False if it timed out"""
+    deadline = time.time() + timeout
+    while not is_ready(driver, selector):
+        if time.time() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL_SECONDS)
+    return True
+
+
+def start_navigation(driver, url):
+    """Navigate the current tab without waiting for the page to load"""
+    driver.execute_script(f"window.{PENDING_MARKER} = true; window.location.href = arguments[0];", url)
+
+
+class DomainPoliteness:
+    """Keep at least `delay` seconds between navigations to the same domain"""
+
+    def __init__(self, delay=DEFAULT_DOMAIN_DELAY):
+        self.delay = delay
+        self.last_navigation = {}
+
+    def delay_left(self, url):
+        last = self.last_navigation.get(urlparse(url).netloc)
+        if last is None:
+            return 0
+        return max(0, last + self.delay - time.time())
+
+    def record(self, url):
+        self.last_navigation[urlparse(url).netloc] = time.time()
+
+    def wait(self, url):
+        """Sleep until the domain may be hit again, then record the navigation"""
+        time.sleep(self.delay_left(url))
+        self.record(url)
+
+
+def get_politeness(spider):
+    """The spider's DomainPoliteness, configured from SELENIUM_DOMAIN_DELAY"""
+    politeness = spider.__dict__.get('politeness')
+    if politeness is None:
+        settings = getattr(spider, 'settings', None)
+        delay = settings.getfloat('SELENIUM_DOMAIN_DELAY', DEFAULT_DOMAIN_DELAY) if settings else DEFAULT_DOMAIN_DELAY
+        politeness = spider.politeness = DomainPoliteness(delay)
+    return politeness
+
+
+def load_page(spider, url, page_type, timeout=DEFAULT_READY_TIMEOUT):
+    """driver.get() after the politeness delay, then wait until the page is ready"""
+    get_politeness(spider).wait(url)
+    spider.driver.get(url)
+    ready = wait_until_ready(spider.driver, ready_selector(spider.name, page_type), timeout)
+    if not ready:
+        spider.logger.warning(f"⏰ Page load timeout: {url}")
+    report_savings(spider, url)
+    return ready
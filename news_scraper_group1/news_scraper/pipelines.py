@@ -10,6 +10,9 @@ import redis
 from datetime import datetime
 from itemadapter import ItemAdapter
 
+from news_scraper.api_endpoints import get_resolver
+from news_scraper.canonical import article_key
+
 class NewsScraperPipeline:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -20,6 +23,8 @@ class NewsScraperPipeline:
             'User-Agent': 'NewsMonitor/1.0'
         })
         self.api_working = True  # Track if API is working
+        # Endpoint URLs are resolved once per TTL and shared with the monitor
+        self.endpoints = get_resolver(self.api_base_url)
         
         # Fallback keywords if API is not available - match API format
         self.fallback_keywords = [
@@ -36,6 +41,9 @@ class NewsScraperPipeline:
         ]
 
     def process_item(self, item, spider):
+        # Same key the spider's dedup used for this article
+        if not item.get('article_key'):
+            item['article_key'] = article_key(item['link'])
         try:
             # Skip API calls if API is not working
             if not self.api_working:
@@ -48,28 +56,19 @@ class NewsScraperPipeline:
             # Get keywords via API with fallback
             keywords = []
             try:
-                # Try multiple endpoints for keywords
-                keyword_endpoints = [
-                    f"{self.api_base_url}/api/keywords/",
-                    f"{self.api_base_url}/api/keywords",
-                    f"{self.api_base_url}/keywords/",
-                    f"{self.api_base_url}/keywords"
-                ]
-                
                 all_keywords = []
-                for endpoint in keyword_endpoints:
+                endpoint = self.endpoints.resolve('keywords')
+                if endpoint:
                     try:
                         response = self.session.get(endpoint, timeout=10)
                         if response.status_code == 200:
                             all_keywords = response.json()
                             self.logger.info(f"✅ Keywords ստացվեցին {endpoint}-ից")
-                            break
                         elif response.status_code == 404:
                             self.logger.warning(f"⚠️ Endpoint չի գտնվել՝ {endpoint}")
-                            continue
+                            self.endpoints.invalidate('keywords')
                     except Exception as e:
                         self.logger.warning(f"⚠️ Network error {endpoint}: {e}")
-                        continue
                 
                 # Use fallback keywords if API failed
                 if not all_keywords:
@@ -130,19 +129,16 @@ class NewsScraperPipeline:
                         'source_url': item.get('source_url', item['link']),
                         'content': item.get('content', ''),
                         'scraped_time': item.get('scraped_time', ''),
+                        'article_key': item['article_key'],
                         'keywords': keywords
                     }
                     
                     # Debug: print article data being sent
                     self.logger.info(f"🔍 Debug: Sending article data: {article_data}")
                     
-                    # Try multiple endpoints for saving articles
-                    save_endpoints = [
-                        f"{self.api_base_url}/api/articles/",
-                        f"{self.api_base_url}/api/articles",
-                        f"{self.api_base_url}/articles/",
-                        f"{self.api_base_url}/articles"
-                    ]
+                    # The resolved save endpoint (at most one URL)
+                    save_endpoint = self.endpoints.resolve('articles')
+                    save_endpoints = [save_endpoint] if save_endpoint else []
                     
                     article_saved = False
                     for endpoint in save_endpoints:
@@ -201,7 +197,8 @@ class NewsScraperPipeline:
                                 except:
                                     self.logger.warning(f"API save error 400: {response.text[:200]}")
                                     continue
-                            elif response.status_code == 404:
+                            elif response.status_code in (404, 405):
+                                self.endpoints.invalidate('articles')
                                 continue
                             else:
                                 self.logger.warning(f"API save error: {response.status_code}")
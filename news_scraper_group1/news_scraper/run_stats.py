@@ -0,0 +1,173 @@
+# Machine-readable run summary for the monitor
+#
+# When a spider closes, SpiderStatsReporter writes one JSON line with its
+# counters, per-stage timings and peak RSS. The monitor passes a pipe file
+# descriptor in SPIDER_STATS_FD (or a path in SPIDER_STATS_FILE) and reads
+# these records instead of scanning log lines.
+
+import os
+import json
+import time
+import inspect
+import logging
+import functools
+from datetime import datetime
+
+import psutil
+from scrapy import signals
+
+# Stats key holding the summary, read by the in-process runner
+SUMMARY_STATS_KEY = 'monitor/summary'
+
+# Spider counters included in the summary (missing ones are reported as 0)
+COUNTER_FIELDS = [
+    'processed_articles',
+    'new_articles',
+    'duplicate_articles',
+    'cached_skips',
+    'blocked_attempts',
+]
+
+logger = logging.getLogger(__name__)
+
+_process = None
+
+
+def sample_rss(spider):
+    """Sample current RSS and keep the peak on the spider"""
+    global _process
+    try:
+        if _process is None:
+            _process = psutil.Process()
+        rss_mb = _process.memory_info().rss / 1024 / 1024
+    except Exception:
+        return 0
+    if rss_mb > spider.__dict__.get('peak_rss_mb', 0):
+        spider.peak_rss_mb = rss_mb
+    return rss_mb
+
+
+def _enter_stage(spider):
+    # Eager spiders set up their driver in __init__, before extensions exist;
+    # the lazy ones at the first render, mid-run. spider_closed() takes the
+    # earlier of this and its own start time, so both are covered
+    spider.__dict__.setdefault('first_stage_at', time.time())
+    stack = spider.__dict__.setdefault('_stage_stack', [])
+    stack.append([time.perf_counter(), 0.0])
+
+
+def _exit_stage(spider, stage):
+    # Stage times are exclusive: time spent in a nested stage is not counted twice
+    stack = spider.__dict__['_stage_stack']
+    started, nested = stack.pop()
+    elapsed = time.perf_counter() - started
+    timings = spider.__dict__.setdefault('stage_timings', {})
+    timings[stage] = timings.get(stage, 0.0) + elapsed - nested
+    if stack:
+        stack[-1][1] += elapsed
+    sample_rss(spider)
+
+
+def timed_stage(stage):
+    """Decorator adding a spider method's run time to spider.stage_timings[stage]
+
+    Works for plain methods and for generator callbacks; for generators only
+    the time spent inside the generator is counted, not the time Scrapy
+    spends between items.
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(self, *args, **kwargs):
+                generator = func(self, *args, **kwargs)
+                while True:
+                    _enter_stage(self)
+                    try:
+                        value = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        _exit_stage(self, stage)
+                    yield value
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            _enter_stage(self)
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                _exit_stage(self, stage)
+        return wrapper
+    return decorator
+
+
+def build_summary(spider, reason, duration_seconds, stats=None):
+    """Collect the spider's counters, timings and peak RSS into one record"""
+    sample_rss(spider)
+    summary = {
+        'spider': spider.name,
+        'reason': reason,
+        'finished_at': datetime.now().isoformat(),
+        'duration_seconds': round(duration_seconds, 3),
+    }
+    for field in COUNTER_FIELDS:
+        summary[field] = int(getattr(spider, field, 0) or 0)
+    summary['stage_seconds'] = {
+        stage: round(seconds, 3) for stage, seconds in spider.__dict__.get('stage_timings', {}).items()
+    }
+    summary['peak_rss_mb'] = round(spider.__dict__.get('peak_rss_mb', 0), 1)
+    # Browser process tree samples from news_scraper.driver_memory, as [page, MB]
+    governor = spider.__dict__.get('memory_governor')
+    if governor is not None:
+        summary['browser_peak_rss_mb'] = round(governor.peak_rss_mb, 1)
+        summary['browser_recycles'] = governor.recycles
+        summary['browser_rss_samples'] = governor.samples
+    # Set by news_scraper.deadline when the run stopped early to meet its budget
+    summary['deadline_hit'] = bool(spider.__dict__.get('deadline_hit', False))
+    if stats is not None:
+        summary['items_scraped'] = stats.get_value('item_scraped_count', 0)
+        # Listings skipped by news_scraper.listing_state as unchanged
+        summary['listing_unchanged'] = stats.get_value('listing/unchanged', 0)
+    return summary
+
+
+def write_summary(summary):
+    """Write one JSON line to SPIDER_STATS_FD or SPIDER_STATS_FILE, if set"""
+    line = json.dumps(summary, ensure_ascii=False) + '\n'
+
+    stats_fd = os.environ.get('SPIDER_STATS_FD')
+    if stats_fd:
+        try:
+            os.write(int(stats_fd), line.encode('utf-8'))
+        except Exception as e:
+            logger.warning(f"⚠️ Stats pipe գրելու սխալ: {e}")
+
+    stats_file = os.environ.get('SPIDER_STATS_FILE')
+    if stats_file:
+        try:
+            with open(stats_file, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except Exception as e:
+            logger.warning(f"⚠️ Stats ֆայլ գրելու սխալ: {e}")
+
+
+class SpiderStatsReporter:
+    """Scrapy extension that emits the run summary when the spider closes"""
+
+    def __init__(self, crawler):
+        self.crawler = crawler
+        self.started = time.time()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        ext = cls(crawler)
+        # Connected after the spider's own closed(), so its counters are final
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_closed(self, spider, reason):
+        started = min(self.started, spider.__dict__.get('first_stage_at', self.started))
+        summary = build_summary(spider, reason, time.time() - started, self.crawler.stats)
+        self.crawler.stats.set_value(SUMMARY_STATS_KEY, summary)
+        write_summary(summary)
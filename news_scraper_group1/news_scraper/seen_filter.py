@@ -0,0 +1,158 @@
+# In-process seen-article store for runs without Redis
+#
+# On Render there usually is no local Redis, so the spiders had no memory
+# between runs and re-rendered every listed article each cycle. SeenFilter
+# keeps the processed keys on local disk instead, one directory per site:
+#
+#   <generation>.bloom  Bloom filter bits, mmap'ed at spider start, so a
+#                       lookup is a few bit tests in shared memory
+#   <generation>.keys   16-byte digests of every key, appended; the exact
+#                       record that confirms a Bloom hit, so a false positive
+#                       never skips a new article
+#
+# dedup.py uses it with DEDUP_BACKEND=bloom, where the SQLite store
+# (seen_store.py) can't be used.
+#
+# A generation covers GENERATION_SECONDS. Lookups consult the generations of
+# the last TTL and files of older generations are deleted on open, which
+# gives the 7-day expiry without touching individual entries.
+#
+# Each site is crawled by one process at a time, so files aren't locked.
+
+import os
+import mmap
+import time
+import hashlib
+import logging
+import tempfile
+
+FILTER_DIR = os.environ.get('DEDUP_FILTER_DIR', os.path.join(tempfile.gettempdir(), 'news_scraper_seen'))
+GENERATION_SECONDS = 24 * 3600
+FILTER_BITS = 1 << 20  # 128 KB per generation, ~1% false positives at 100k keys
+FILTER_HASHES = 7
+DIGEST_SIZE = 16
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(key):
+    return hashlib.md5(key.encode()).digest()
+
+
+def _bit_positions(digest, bits=FILTER_BITS, hashes=FILTER_HASHES):
+    # Double hashing on the two halves of the digest
+    a = int.from_bytes(digest[:8], 'little')
+    b = int.from_bytes(digest[8:], 'little') | 1
+    return [(a + i * b) % bits for i in range(hashes)]
+
+
+class Generation:
+    """One generation's Bloom bits (mmap) and exact digest file"""
+
+    def __init__(self, directory, number, bits=FILTER_BITS):
+        self.number = number
+        self.bits = bits
+        bloom_path = os.path.join(directory, f"{number}.bloom")
+        size = bits // 8
+        with open(bloom_path, 'a+b') as f:
+            if os.fstat(f.fileno()).st_size < size:
+                f.truncate(size)
+        self.bloom_file = open(bloom_path, 'r+b')
+        self.bloom = mmap.mmap(self.bloom_file.fileno(), size)
+        self.keys_path = os.path.join(directory, f"{number}.keys")
+        self.keys_file = open(self.keys_path, 'a+b')
+        self.keys_map = None
+        self.keys_mapped_size = 0
+        # Digests appended by this process since keys_map was taken
+        self.recent = set()
+
+    def might_contain(self, positions):
+        bloom = self.bloom
+        return all(bloom[position >> 3] & (1 << (position & 7)) for position in positions)
+
+    def _contains_exact(self, digest):
+        if digest in self.recent:
+            return True
+        size = os.path.getsize(self.keys_path)
+        if size != self.keys_mapped_size:
+            if self.keys_map is not None:
+                self.keys_map.close()
+            self.keys_map = mmap.mmap(self.keys_file.fileno(), size, access=mmap.ACCESS_READ) if size else None
+            self.keys_mapped_size = size
+            self.recent.clear()
+        if self.keys_map is None:
+            return False
+        # Records are fixed-size; only aligned matches count
+        offset = self.keys_map.find(digest)
+        while offset != -1:
+            if offset % DIGEST_SIZE == 0:
+                return True
+            offset = self.keys_map.find(digest, offset + 1)
+        return False
+
+    def contains(self, digest, positions):
+        return self.might_contain(positions) and self._contains_exact(digest)
+
+    def add(self, digests):
+        bloom = self.bloom
+        for digest in digests:
+            for position in _bit_positions(digest, self.bits):
+                bloom[position >> 3] |= 1 << (position & 7)
+        self.keys_file.write(b''.join(digests))
+        self.keys_file.flush()
+        self.recent.update(digests)
+
+    def close(self):
+        self.bloom.flush()
+        self.bloom.close()
+        self.bloom_file.close()
+        if self.keys_map is not None:
+            self.keys_map.close()
+        self.keys_file.close()
+
+
+class SeenFilter:
+    """Set of processed keys with a TTL, Bloom-fronted and exact on disk"""
+
+    def __init__(self, directory, ttl, generation_seconds=GENERATION_SECONDS, bits=FILTER_BITS):
+        os.makedirs(directory, exist_ok=True)
+        current = int(time.time() // generation_seconds)
+        # One extra generation, so every key is kept for at least ttl (and at
+        # most ttl + generation_seconds)
+        oldest = current - ttl // generation_seconds
+        self._remove_expired(directory, oldest)
+        self.bits = bits
+        self.generations = [Generation(directory, number, bits) for number in range(current, oldest - 1, -1)]
+
+    @staticmethod
+    def _remove_expired(directory, oldest):
+        for name in os.listdir(directory):
+            number, _, extension = name.partition('.')
+            if extension in ('bloom', 'keys') and number.isdigit() and int(number) < oldest:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+    def contains(self, key):
+        digest = _digest(key)
+        positions = _bit_positions(digest, self.bits)
+        return any(generation.contains(digest, positions) for generation in self.generations)
+
+    def add_many(self, keys):
+        # Written to the current generation only; lookups check all of them
+        self.generations[0].add([_digest(key) for key in keys])
+
+    def close(self):
+        for generation in self.generations:
+            generation.close()
+        self.generations = []
+
+
+def open_seen_filter(site, ttl, directory=FILTER_DIR):
+    """The site's SeenFilter, or None if it can't be opened"""
+    try:
+        return SeenFilter(os.path.join(directory, site), ttl)
+    except Exception as e:
+        logger.warning(f"⚠️ Տեղական dedup ֆայլը չբացվեց ({site}): {e}")
+        return None
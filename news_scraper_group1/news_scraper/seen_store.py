@@ -0,0 +1,165 @@
+# Persistent seen-article store in SQLite, the single-node alternative to Redis
+#
+# start.sh runs the monitor under `timeout 1800`, and every restart used to
+# start the spiders with an empty memory when Redis wasn't there, so each
+# restart re-rendered every listed article of every site. SeenStore keeps one
+# row per processed article in a SQLite file under logs/ (WAL mode, so spider
+# processes read while another one writes):
+#
+#   key              processed_<site>:<article key>, what dedup looks up
+#   site, url        the site and the article's canonical URL (canonical.py)
+#   first_seen       when it was first marked; rows expire TTL after this
+#   content_hash     md5 of the extracted text, when the spider had it
+#   keyword_version  md5 of the keyword set the article was matched against
+#
+# ArticleDedup already batches marks, and add_many() writes each batch in one
+# transaction. Expired rows are deleted by a background thread, at most once
+# per COMPACT_INTERVAL_SECONDS across all processes, in small chunks so
+# writers are never blocked for long.
+#
+# Like manifest.py, this module must stay importable without Scrapy.
+
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+
+DB_FILE = os.environ.get('DEDUP_DB_FILE', os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'logs', 'seen_articles.db'))
+COMPACT_INTERVAL_SECONDS = int(os.environ.get('DEDUP_COMPACT_INTERVAL_SECONDS', 3600))
+COMPACT_CHUNK = 500
+# SQLite's default limit on host parameters is 999
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key TEXT PRIMARY KEY,
+    site TEXT,
+    url TEXT,
+    first_seen REAL NOT NULL,
+    content_hash TEXT,
+    keyword_version TEXT
+);
+CREATE INDEX IF NOT EXISTS seen_first_seen ON seen (first_seen);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(content):
+    return hashlib.md5(content.encode()).hexdigest() if content else None
+
+
+def keyword_set_version(keywords):
+    """Same value for the same keywords in any order"""
+    return hashlib.md5('\n'.join(sorted(set(keywords or []))).encode()).hexdigest()
+
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    return connection
+
+
+class SeenStore:
+    """Processed articles with a TTL in a WAL-mode SQLite file"""
+
+    def __init__(self, path=DB_FILE, ttl=7 * 24 * 3600, compact_interval=COMPACT_INTERVAL_SECONDS):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.compact_interval = compact_interval
+        self.connection = _connect(path)
+        self.connection.executescript(SCHEMA)
+        self.stopped = threading.Event()
+        self.compactor = threading.Thread(target=self._compact_loop, name='seen-store-compactor', daemon=True)
+        self.compactor.start()
+
+    def contains_many(self, keys):
+        """One bool per key: seen within the TTL"""
+        cutoff = time.time() - self.ttl
+        found = set()
+        for start in range(0, len(keys), LOOKUP_CHUNK):
+            chunk = keys[start:start + LOOKUP_CHUNK]
+            rows = self.connection.execute(
+                f"SELECT key FROM seen WHERE first_seen >= ? AND key IN ({','.join('?' * len(chunk))})",
+                [cutoff, *chunk])
+            found.update(key for key, in rows)
+        return [key in found for key in keys]
+
+    def add_many(self, site, records, keyword_version=None):
+        """Write (key, url, content_hash) records in one transaction; first_seen is kept for known keys"""
+        now = time.time()
+        with self.connection:
+            # An expired row that hasn't been compacted yet starts over
+            self.connection.executemany(
+                "INSERT INTO seen (key, site, url, first_seen, content_hash, keyword_version) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET first_seen = excluded.first_seen, "
+                "content_hash = excluded.content_hash, keyword_version = excluded.keyword_version "
+                "WHERE seen.first_seen < ?",
+                [(key, site, url, now, digest, keyword_version, now - self.ttl) for key, url, digest in records])
+
+    def _claim_compaction(self, connection):
+        # Only one process compacts per interval
+        now = time.time()
+        with connection:
+            row = connection.execute("SELECT value FROM meta WHERE name = 'compacted_at'").fetchone()
+            if row and now - row[0] < self.compact_interval:
+                return False
+            connection.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('compacted_at', ?)", (now,))
+        return True
+
+    def compact(self, connection=None):
+        """Delete expired rows in chunks; returns how many were deleted"""
+        connection = connection or self.connection
+        cutoff = time.time() - self.ttl
+        deleted = 0
+        while not self.stopped.is_set():
+            with connection:
+                count = connection.execute(
+                    "DELETE FROM seen WHERE key IN (SELECT key FROM seen WHERE first_seen < ? LIMIT ?)",
+                    (cutoff, COMPACT_CHUNK)).rowcount
+            deleted += count
+            if count < COMPACT_CHUNK:
+                break
+        if deleted:
+            connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        return deleted
+
+    def _compact_loop(self):
+        try:
+            connection = _connect(self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Seen store compaction-ը չսկսվեց: {e}")
+            return
+        try:
+            while not self.stopped.is_set():
+                try:
+                    if self._claim_compaction(connection):
+                        deleted = self.compact(connection)
+                        if deleted:
+                            logger.info(f"🧹 Seen store-ից ջնջվեց {deleted} հին հոդված")
+                except Exception as e:
+                    logger.warning(f"⚠️ Seen store compaction սխալ: {e}")
+                self.stopped.wait(self.compact_interval)
+        finally:
+            connection.close()
+
+    def close(self):
+        self.stopped.set()
+        self.compactor.join(timeout=5)
+        self.connection.close()
+
+
+def open_seen_store(ttl, path=DB_FILE):
+    """The shared SeenStore, or None if the database can't be opened"""
+    try:
+        return SeenStore(path, ttl)
+    except Exception as e:
+        logger.warning(f"⚠️ Seen store-ը չբացվեց ({path}): {e}")
+        return None
@@ -1,6 +1,10 @@
 # Scrapy settings for news_scraper_group1 project (MAJOR NEWS SITES)
 # Simplified version without Django for Render.com deployment
 
+import os
+
+from news_scraper.resource_blocking import DEFAULT_RESOURCE_TYPES, DEFAULT_BLOCKED_DOMAINS
+
 BOT_NAME = "news_scraper_group1"
 
 SPIDER_MODULES = ["news_scraper.spiders"]
@@ -57,11 +61,53 @@ DEFAULT_REQUEST_HEADERS = {
 # Disable image loading to save memory
 DOWNLOADER_MIDDLEWARES = {
     'scrapy.downloadermiddlewares.media.MediaPipeline': None,
+    # After DownloaderStats (850) so browser-rendered pages are still counted
+    'news_scraper.middlewares.SeleniumRenderMiddleware': 950,
 }
 
 # Disable media pipeline
 MEDIA_ALLOW_REDIRECTS = False
 
+# Emit a JSON run summary for the monitor when each spider closes,
+# and close spiders gracefully when the monitor's deadline runs out
+EXTENSIONS = {
+    "news_scraper.run_stats.SpiderStatsReporter": 500,
+    "news_scraper.deadline.SpiderDeadline": 510,
+}
+
+# Stop taking new articles this many seconds before the run's deadline
+DEADLINE_DRAIN_SECONDS = 20
+
+# Selenium spiders load articles in this many tabs of one Chrome at once,
+# with at most RENDER_TABS_PER_DOMAIN loads in flight per site
+RENDER_TABS = 3
+RENDER_TABS_PER_DOMAIN = 2
+
+# 'selenium': the spider's blocking Selenium driver (default).
+# 'cdp': render pages for SeleniumRenderMiddleware over the DevTools protocol
+# on the reactor's asyncio loop (async_browser.py), in a browser pool Chrome;
+# falls back to Selenium when no pool browser is available. Opt in with the
+# BROWSER_BACKEND env var, or per spider in custom_settings.
+BROWSER_BACKEND = os.environ.get('BROWSER_BACKEND', 'selenium')
+
+# Seconds between Selenium page loads on the same site (politeness), kept
+# separate from the readiness waits in page_ready.py
+SELENIUM_DOMAIN_DELAY = 2.0
+
+# Chrome is recycled when its process tree RSS reaches DRIVER_MAX_RSS_MB or
+# grows by more than DRIVER_MAX_GROWTH_MB_PER_PAGE over DRIVER_GROWTH_WINDOW
+# rendered pages (driver_memory.py)
+DRIVER_MAX_RSS_MB = 700
+DRIVER_MAX_GROWTH_MB_PER_PAGE = 15
+DRIVER_GROWTH_WINDOW = 5
+
+# Requests every Selenium tab blocks over CDP (resource_blocking.py): resource
+# types out of image/font/media/stylesheet, plus third-party ad/analytics
+# domains. The defaults live in resource_blocking.py; empty lists turn
+# blocking off.
+BLOCKED_RESOURCE_TYPES = list(DEFAULT_RESOURCE_TYPES)
+BLOCKED_DOMAINS = list(DEFAULT_BLOCKED_DOMAINS)
+
 # Configure item pipelines
 ITEM_PIPELINES = {
    "news_scraper.pipelines.NewsScraperPipeline": 300,
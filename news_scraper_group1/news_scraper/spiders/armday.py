@@ -1,13 +1,21 @@
 import scrapy
 from news_scraper.items import NewsScraperItem
+from news_scraper.run_stats import timed_stage
+from news_scraper.deadline import deadline_near
+from news_scraper.dedup import ArticleDedup, requested_url
+from news_scraper.listing_state import listing_unchanged, save_listing_fingerprints
+from news_scraper.browser_pool import checkout_driver, checkin_driver
+from news_scraper.page_lifecycle import close_lifecycle, get_lifecycle
+from news_scraper.driver_memory import browser_rss_mb, driver_needs_recycle
+from news_scraper.resource_blocking import block_resources, report_savings
+from news_scraper.fetch_strategy import browser_fallback, extraction_succeeded
+from news_scraper.page_ready import PAGE_LOAD_STRATEGY, ready_selector, wait_until_ready
 import os
-import hashlib
 import redis
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 import time
 import requests
 import gc
@@ -50,9 +58,8 @@ class ArmDaySpider(scrapy.Spider):
     def __init__(self, *args, **kwargs):
         super(ArmDaySpider, self).__init__(*args, **kwargs)
         
-        # Initialize Selenium WebDriver
+        # Selenium WebDriver, started on the first page that needs a browser
         self.driver = None
-        self.setup_selenium()
         
         # Redis connection
         try:
@@ -62,6 +69,8 @@ class ArmDaySpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"🔴 Redis չկա, կաշխատի առանց cache: {e}")
             self.redis_client = None
+        # Cache checks and marks batched into pipelined round trips
+        self.dedup = ArticleDedup(self.redis_client, 'armday')
 
         # API client
         self.api_base_url = os.environ.get('API_BASE_URL', 'https://beackkayq.onrender.com')
@@ -84,6 +93,7 @@ class ArmDaySpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"Բանալի բառերը չհաջողվեց բեռնել: {e}")
             self.keywords = []
+        self.dedup.set_keywords(self.keywords)
 
         # Statistics
         self.processed_articles = 0
@@ -91,14 +101,12 @@ class ArmDaySpider(scrapy.Spider):
         self.duplicate_articles = 0  # Add missing counter used by pipeline
         self.cached_skips = 0
         
-        # Memory management
-        self.articles_since_restart = 0
-        self.max_articles_before_restart = 20  # Restart driver every 20 articles
-        
+    @timed_stage('driver_setup')
     def setup_selenium(self):
         """Setup Selenium WebDriver with optimal settings for memory usage"""
         try:
             chrome_options = Options()
+            chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY  # get() returns at DOMContentLoaded
             chrome_options.add_argument('--headless')  # Run in background
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
@@ -112,17 +120,17 @@ class ArmDaySpider(scrapy.Spider):
             # Memory optimization options
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')  # Don't load images
-            chrome_options.add_argument('--disable-javascript')  # Disable JS if not needed
-            chrome_options.add_argument('--disable-css')  # Disable CSS if not needed
             chrome_options.add_argument('--disable-web-security')
             chrome_options.add_argument('--disable-features=VizDisplayCompositor')
             chrome_options.add_argument('--memory-pressure-off')
             chrome_options.add_argument('--max_old_space_size=512')  # Limit memory usage
             
-            # Try to initialize Chrome driver
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Try to initialize Chrome driver (a warm one from the shared pool first)
+            self.driver = checkout_driver(self)
+            if not self.driver:
+                self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            block_resources(self)  # Images, fonts, media and ad/analytics domains over CDP
             self.logger.info("🚗 Selenium Chrome driver կապակցված է (memory optimized)")
             
         except Exception as e:
@@ -133,30 +141,34 @@ class ArmDaySpider(scrapy.Spider):
         """Restart Selenium driver to free memory"""
         if self.driver:
             try:
-                self.driver.quit()
+                # A pooled Chrome that grew this big isn't handed to the next spider
+                if not checkin_driver(self, recycle=True):
+                    self.driver.quit()
                 self.logger.info("🔄 Restarting Selenium driver for memory cleanup")
             except Exception as e:
                 self.logger.warning(f"⚠️ Driver quit error: {e}")
         
-        # Reset counter
-        self.articles_since_restart = 0
-        
         # Setup new driver
         self.setup_selenium()
     
     def log_memory_usage(self):
-        """Log current memory usage"""
+        """Log current memory usage (this process and its Chrome process tree)"""
         try:
             process = psutil.Process()
             memory_info = process.memory_info()
             memory_mb = memory_info.rss / 1024 / 1024
+            chrome_mb = browser_rss_mb(self)
+            if chrome_mb is not None:
+                self.logger.info(f"💾 Memory usage: {memory_mb:.1f} MB (+ Chrome {chrome_mb:.1f} MB)")
+                return memory_mb + chrome_mb
             self.logger.info(f"💾 Memory usage: {memory_mb:.1f} MB")
             return memory_mb
         except Exception as e:
             self.logger.warning(f"⚠️ Memory monitoring error: {e}")
             return 0
 
-    def get_page_with_selenium(self, url):
+    @timed_stage('render')
+    def get_page_with_selenium(self, url, page_type='article'):
         """Get page content using Selenium with memory optimization"""
         if not self.driver:
             self.logger.error("❌ Selenium driver չկա")
@@ -165,39 +177,17 @@ class ArmDaySpider(scrapy.Spider):
         try:
             self.logger.info(f"🌐 Selenium-ով բեռնվում է: {url}")
             
-            # Clear browser cache and memory before loading new page
-            self.driver.delete_all_cookies()
-            self.driver.execute_script("window.localStorage.clear();")
-            self.driver.execute_script("window.sessionStorage.clear();")
-            
-            self.driver.get(url)
-            
-            # Wait for content to load (reduced wait time)
-            time.sleep(2)
-            
-            # Wait for specific elements that indicate content is loaded
-            try:
-                WebDriverWait(self.driver, 8).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
-                )
-            except TimeoutException:
-                self.logger.warning("⏰ Page load timeout")
-            
-            # Get page source and immediately clear memory
-            page_source = self.driver.page_source
-            
-            # Clear memory after getting content
-            self.driver.execute_script("""
-                // Clear DOM elements to free memory
-                var elements = document.querySelectorAll('*');
-                for(var i = 0; i < elements.length; i++) {
-                    if(elements[i].tagName !== 'HTML' && elements[i].tagName !== 'HEAD' && elements[i].tagName !== 'BODY') {
-                        elements[i].innerHTML = '';
-                    }
-                }
-            """)
-            
-            return page_source
+            # A fresh tab in the site's browser context, closed right after
+            # extraction; cookies and storage are dropped with the context
+            with get_lifecycle(self).page():
+                self.driver.get(url)
+                
+                # Wait until the site's content is rendered (or the network goes idle)
+                if not wait_until_ready(self.driver, ready_selector(self.name, page_type)):
+                    self.logger.warning("⏰ Page load timeout")
+                report_savings(self, url)
+                
+                return self.driver.page_source
             
         except WebDriverException as e:
             self.logger.error(f"❌ Selenium error: {e}")
@@ -206,24 +196,14 @@ class ArmDaySpider(scrapy.Spider):
             self.logger.error(f"❌ Unexpected error: {e}")
             return None
 
-    def is_article_processed(self, url, title):
-        """Check if article was already processed using Redis cache"""
-        if not self.redis_client:
-            return False
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_armday:{article_hash}"
-        return self.redis_client.exists(cache_key)
+    def is_article_processed(self, url):
+        """Check if article was already processed (Redis or local dedup store)"""
+        return self.dedup.is_processed(url)
 
-    def mark_article_processed(self, url, title):
-        """Mark article as processed in Redis cache"""
-        if not self.redis_client:
-            return
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_armday:{article_hash}"
-        # Mark as processed (expire in 7 days)
-        self.redis_client.setex(cache_key, 604800, "1")
+    def mark_article_processed(self, url, content=None, original_url=None):
+        """Mark article as processed (Redis or local dedup store)"""
+        # Buffered; flushed in batches and when the spider closes
+        self.dedup.mark(url, content, original_url)
 
     def article_contains_keyword(self, article_text):
         if not article_text:
@@ -238,32 +218,11 @@ class ArmDaySpider(scrapy.Spider):
     def start_requests(self):
         """Override start_requests to use Selenium"""
         for url in self.start_urls:
-            # Use a dummy request since we'll use Selenium
-            yield scrapy.Request(url, callback=self.parse_with_selenium, dont_filter=True)
+            # Fetched by SeleniumRenderMiddleware: plain HTTP first, Chrome when the site needs it
+            yield scrapy.Request(url, callback=self.parse, dont_filter=True,
+                                 meta={'selenium': True, 'page_type': 'listing'})
     
-    def parse_with_selenium(self, response):
-        """Parse page using Selenium to get JavaScript-rendered content"""
-        if not self.driver:
-            self.logger.error("❌ Selenium driver չկա, սովորական parsing")
-            yield from self.parse(response)
-            return
-        
-        # Get page content with Selenium
-        html_content = self.get_page_with_selenium(response.url)
-        if not html_content:
-            self.logger.error(f"❌ Selenium չկարողացավ բեռնել: {response.url}")
-            return
-        
-        # Create a new response object with Selenium content
-        from scrapy.http import HtmlResponse
-        selenium_response = HtmlResponse(
-            url=response.url,
-            body=html_content,
-            encoding='utf-8'
-        )
-        
-        yield from self.parse(selenium_response)
-
+    @timed_stage('listing')
     def parse(self, response):
         # Extract articles using enhanced selectors for JavaScript-loaded content
         selectors_to_try = [
@@ -298,9 +257,21 @@ class ArmDaySpider(scrapy.Spider):
         
         self.logger.info(f"📰 Գտնվել է {len(articles)} հոդված (օպտիմիզացված - սահմանափակված 10-ով)")
         
+        # Nothing found over HTTP: the listing may need JS, retry it in the browser
+        if not articles:
+            fallback = browser_fallback(self, response)
+            if fallback:
+                yield fallback
+                return
+        else:
+            extraction_succeeded(self, response)
+
         # Limit to latest 10 articles only for optimization (running every 10 minutes)
         articles = articles[:10]
 
+        # Collect the candidates first, so the cache is checked for all of
+        # them in one round trip
+        candidates = []
         for article in articles:
             # Extract link and title using multiple selectors
             link = (article.css("div.item-header a::attr(href)").get() or
@@ -314,46 +285,31 @@ class ArmDaySpider(scrapy.Spider):
                            article.css("::text").get())
             
             if link and title_preview:
-                full_url = response.urljoin(link)
-                
-                # Check Redis cache first
-                if self.is_article_processed(full_url, title_preview):
-                    self.cached_skips += 1
-                    continue
-                    
-                # Use Selenium for individual articles too
-                yield scrapy.Request(full_url, callback=self.parse_article_with_selenium)
-    
-    def parse_article_with_selenium(self, response):
-        """Parse article page using Selenium to get JavaScript-rendered content"""
-        if not self.driver:
-            self.logger.error("❌ Selenium driver չկա, սովորական parsing")
-            yield from self.parse_article(response)
-            return
-        
-        # Get page content with Selenium
-        html_content = self.get_page_with_selenium(response.url)
-        if not html_content:
-            self.logger.error(f"❌ Selenium չկարողացավ բեռնել: {response.url}")
+                candidates.append((response.urljoin(link), title_preview))
+
+        # Same links as the last completed run: nothing new to look at
+        if listing_unchanged(self, response.url, (url for url, _ in candidates)):
             return
-        
-        # Create a new response object with Selenium content
-        from scrapy.http import HtmlResponse
-        selenium_response = HtmlResponse(
-            url=response.url,
-            body=html_content,
-            encoding='utf-8'
-        )
-        
-        yield from self.parse_article(selenium_response)
+        self.dedup.prefetch(url for url, _ in candidates)
 
+        for full_url, title_preview in candidates:
+            # Stop discovering new articles when the run's deadline is near
+            if deadline_near(self):
+                break
+            
+            # Check Redis cache first (answered from the prefetch)
+            if self.is_article_processed(full_url):
+                self.cached_skips += 1
+                continue
+                
+            # Same HTTP-first fetch for individual articles
+            yield scrapy.Request(full_url, callback=self.parse_article,
+                                 meta={'selenium': True, 'page_type': 'article'})
+    
+    @timed_stage('article')
     def parse_article(self, response):
-        self.processed_articles += 1
-        self.articles_since_restart += 1
-        
-        # Check if we need to restart driver for memory cleanup
-        if self.articles_since_restart >= self.max_articles_before_restart:
-            self.logger.info(f"🔄 Memory cleanup: processed {self.articles_since_restart} articles, restarting driver")
+        # Recycle Chrome when its process tree is too big or keeps growing
+        if self.driver and response.meta.get('rendered') and driver_needs_recycle(self):
             self.restart_driver()
 
         # Try multiple title selectors (enhanced for JavaScript content)
@@ -518,10 +474,11 @@ class ArmDaySpider(scrapy.Spider):
         
         # Only process if we have meaningful content
         if content and len(content.strip()) > 50:  # Ensure minimum content length
+            extraction_succeeded(self, response)
             if self.article_contains_keyword(title) or self.article_contains_keyword(content):
                 self.logger.info(f"✅ Բանալի բառ գտնվեց: {display_title}")
                 # Mark as processed only after successful keyword match
-                self.mark_article_processed(response.url, title)
+                self.mark_article_processed(response.url, content, requested_url(response))
                 self.new_articles += 1
                 
                 item = NewsScraperItem()
@@ -534,11 +491,17 @@ class ArmDaySpider(scrapy.Spider):
             else:
                 self.logger.info(f"❌ Բանալի բառ չգտնվեց: {display_title}")
                 # Mark as processed even if no keyword match to avoid re-checking
-                self.mark_article_processed(response.url, title)
+                self.mark_article_processed(response.url, content, requested_url(response))
         else:
+            # Too little text over HTTP: retry the article in the browser
+            fallback = browser_fallback(self, response)
+            if fallback:
+                yield fallback
+                return
             self.logger.info(f"⚠️ Անբավարար պարունակություն: {display_title}")
             # Mark as processed to avoid re-checking
-            self.mark_article_processed(response.url, title)
+            self.mark_article_processed(response.url, content, requested_url(response))
+        self.processed_articles += 1
         
         # Memory cleanup after each article
         gc.collect()  # Force garbage collection
@@ -549,10 +512,15 @@ class ArmDaySpider(scrapy.Spider):
 
     def closed(self, reason):
         """Called when spider finishes"""
+        self.dedup.close()
+        save_listing_fingerprints(self, reason)
+        
         # Clean up Selenium driver
         if self.driver:
             try:
-                self.driver.quit()
+                close_lifecycle(self)  # The site's cookies, storage and cache
+                if not checkin_driver(self):
+                    self.driver.quit()
                 self.logger.info("🚗 Selenium driver փակված է")
             except Exception as e:
                 self.logger.warning(f"⚠️ Selenium driver cleanup error: {e}")
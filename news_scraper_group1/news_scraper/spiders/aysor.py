@@ -1,17 +1,22 @@
 import scrapy
 from news_scraper.items import NewsScraperItem
+from news_scraper.run_stats import timed_stage
+from news_scraper.deadline import deadline_near
+from news_scraper.dedup import ArticleDedup, requested_url
+from news_scraper.listing_state import listing_unchanged, save_listing_fingerprints
+from news_scraper.browser_pool import checkout_driver, checkin_driver
+from news_scraper.page_lifecycle import close_lifecycle, get_lifecycle
+from news_scraper.resource_blocking import block_resources, report_savings
+from news_scraper.fetch_strategy import browser_fallback, extraction_succeeded
+from news_scraper.page_ready import PAGE_LOAD_STRATEGY, ready_selector, wait_until_ready
 import sys
 import os
-import hashlib
 import redis
 from datetime import datetime
 from urllib.parse import unquote
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import WebDriverException
 import time
 import requests
 
@@ -38,9 +43,8 @@ class AysorSpider(scrapy.Spider):
     def __init__(self, *args, **kwargs):
         super(AysorSpider, self).__init__(*args, **kwargs)
         
-        # Initialize Selenium WebDriver
+        # Selenium WebDriver, started on the first page that needs a browser
         self.driver = None
-        self.setup_selenium()
         
         # Redis connection
         try:
@@ -50,6 +54,8 @@ class AysorSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"🔴 Redis չկա, կաշխատի առանց cache: {e}")
             self.redis_client = None
+        # Cache checks and marks batched into pipelined round trips
+        self.dedup = ArticleDedup(self.redis_client, 'aysor')
 
         # API client
         self.api_base_url = os.environ.get('API_BASE_URL', 'https://beackkayq.onrender.com')
@@ -72,6 +78,7 @@ class AysorSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"Բանալի բառերը չհաջողվեց բեռնել: {e}")
             self.keywords = []
+        self.dedup.set_keywords(self.keywords)
 
         # Statistics
         self.processed_articles = 0
@@ -79,10 +86,12 @@ class AysorSpider(scrapy.Spider):
         self.duplicate_articles = 0  # Add missing counter used in pipeline
         self.cached_skips = 0
         
+    @timed_stage('driver_setup')
     def setup_selenium(self):
         """Setup Selenium WebDriver with optimal settings"""
         try:
             chrome_options = Options()
+            chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY  # get() returns at DOMContentLoaded
             chrome_options.add_argument('--headless')  # Run in background
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
@@ -93,16 +102,20 @@ class AysorSpider(scrapy.Spider):
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
-            # Try to initialize Chrome driver
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Try to initialize Chrome driver (a warm one from the shared pool first)
+            self.driver = checkout_driver(self)
+            if not self.driver:
+                self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            block_resources(self)  # Images, fonts, media and ad/analytics domains over CDP
             self.logger.info("🚗 Selenium Chrome driver կապակցված է")
             
         except Exception as e:
             self.logger.error(f"❌ Selenium setup failed: {e}")
             self.driver = None
     
-    def get_page_with_selenium(self, url):
+    @timed_stage('render')
+    def get_page_with_selenium(self, url, page_type='article'):
         """Get page content using Selenium"""
         if not self.driver:
             self.logger.error("❌ Selenium driver չկա")
@@ -110,20 +123,18 @@ class AysorSpider(scrapy.Spider):
             
         try:
             self.logger.info(f"🌐 Selenium-ով բեռնվում է: {url}")
-            self.driver.get(url)
             
-            # Wait for content to load
-            time.sleep(3)
-            
-            # Wait for specific elements that indicate content is loaded
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
-                )
-            except TimeoutException:
-                self.logger.warning("⏰ Page load timeout")
-            
-            return self.driver.page_source
+            # A fresh tab in the site's browser context, closed right after
+            # extraction; cookies and storage are dropped with the context
+            with get_lifecycle(self).page():
+                self.driver.get(url)
+                
+                # Wait until the site's content is rendered (or the network goes idle)
+                if not wait_until_ready(self.driver, ready_selector(self.name, page_type)):
+                    self.logger.warning("⏰ Page load timeout")
+                report_savings(self, url)
+                
+                return self.driver.page_source
             
         except WebDriverException as e:
             self.logger.error(f"❌ Selenium error: {e}")
@@ -132,24 +143,14 @@ class AysorSpider(scrapy.Spider):
             self.logger.error(f"❌ Unexpected error: {e}")
             return None
 
-    def is_article_processed(self, url, title):
-        """Check if article was already processed using Redis cache"""
-        if not self.redis_client:
-            return False
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_aysor:{article_hash}"
-        return self.redis_client.exists(cache_key)
+    def is_article_processed(self, url):
+        """Check if article was already processed (Redis or local dedup store)"""
+        return self.dedup.is_processed(url)
 
-    def mark_article_processed(self, url, title):
-        """Mark article as processed in Redis cache"""
-        if not self.redis_client:
-            return
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_aysor:{article_hash}"
-        # Mark as processed (expire in 7 days)
-        self.redis_client.setex(cache_key, 604800, "1")
+    def mark_article_processed(self, url, content=None, original_url=None):
+        """Mark article as processed (Redis or local dedup store)"""
+        # Buffered; flushed in batches and when the spider closes
+        self.dedup.mark(url, content, original_url)
 
     def article_contains_keyword(self, article_text):
         if not article_text:
@@ -168,32 +169,11 @@ class AysorSpider(scrapy.Spider):
     def start_requests(self):
         """Override start_requests to use Selenium"""
         for url in self.start_urls:
-            # Use a dummy request since we'll use Selenium
-            yield scrapy.Request(url, callback=self.parse_with_selenium, dont_filter=True)
+            # Fetched by SeleniumRenderMiddleware: plain HTTP first, Chrome when the site needs it
+            yield scrapy.Request(url, callback=self.parse, dont_filter=True,
+                                 meta={'selenium': True, 'page_type': 'listing'})
     
-    def parse_with_selenium(self, response):
-        """Parse page using Selenium to get JavaScript-rendered content"""
-        if not self.driver:
-            self.logger.error("❌ Selenium driver չկա, սովորական parsing")
-            yield from self.parse(response)
-            return
-        
-        # Get page content with Selenium
-        html_content = self.get_page_with_selenium(response.url)
-        if not html_content:
-            self.logger.error(f"❌ Selenium չկարողացավ բեռնել: {response.url}")
-            return
-        
-        # Create a new response object with Selenium content
-        from scrapy.http import HtmlResponse
-        selenium_response = HtmlResponse(
-            url=response.url,
-            body=html_content,
-            encoding='utf-8'
-        )
-        
-        yield from self.parse(selenium_response)
-
+    @timed_stage('listing')
     def parse(self, response):
         # Check if this is an article page or a listing page
         if '/news/' in response.url and len(response.url.split('/')) > 6:
@@ -246,11 +226,23 @@ class AysorSpider(scrapy.Spider):
             articles = potential_articles
             self.logger.info(f"🔍 Գտնվել է {len(articles)} հավանական հոդվածներ URL pattern-ներով")
         
+        # Nothing found over HTTP: the listing may need JS, retry it in the browser
+        if not articles:
+            fallback = browser_fallback(self, response)
+            if fallback:
+                yield fallback
+                return
+        else:
+            extraction_succeeded(self, response)
+
         # Limit to latest 10 articles only for optimization (running every 10 minutes)
         articles = articles[:10]
         
         self.logger.info(f"📰 Գտնվել է {len(articles)} հոդված (սահմանափակված 10-ով)")
 
+        # Collect the candidates first, so the cache is checked for all of
+        # them in one round trip
+        candidates = []
         for article in articles:
             # Extract link from news title - try multiple selectors
             link = (article.css("a.news_title::attr(href)").get() or
@@ -262,46 +254,32 @@ class AysorSpider(scrapy.Spider):
                            article.css("::text").get())  # If article is already an 'a' element
             
             if link and title_preview:
-                # Make URL absolute
-                full_url = response.urljoin(link)
+                candidates.append((response.urljoin(link), title_preview))
+
+        # Same links as the last completed run: nothing new to look at
+        if listing_unchanged(self, response.url, (url for url, _ in candidates)):
+            return
+        self.dedup.prefetch(url for url, _ in candidates)
+
+        for full_url, title_preview in candidates:
+            # Stop discovering new articles when the run's deadline is near
+            if deadline_near(self):
+                break
+            
+            # Check Redis cache first (answered from the prefetch)
+            if self.is_article_processed(full_url):
+                self.cached_skips += 1
+                continue
                 
-                # Check Redis cache first
-                if self.is_article_processed(full_url, title_preview):
-                    self.cached_skips += 1
-                    continue
-                    
-                # Use Selenium for individual articles too
-                yield scrapy.Request(full_url, callback=self.parse_article_with_selenium)
+            # Same HTTP-first fetch for individual articles
+            yield scrapy.Request(full_url, callback=self.parse_article,
+                                 meta={'selenium': True, 'page_type': 'article'})
 
         # Pagination removed - only processing latest 10 articles for optimization
 
 
-    def parse_article_with_selenium(self, response):
-        """Parse article page using Selenium to get JavaScript-rendered content"""
-        if not self.driver:
-            self.logger.error("❌ Selenium driver չկա, սովորական parsing")
-            yield from self.parse_article(response)
-            return
-        
-        # Get page content with Selenium
-        html_content = self.get_page_with_selenium(response.url)
-        if not html_content:
-            self.logger.error(f"❌ Selenium չկարողացավ բեռնել: {response.url}")
-            return
-        
-        # Create a new response object with Selenium content
-        from scrapy.http import HtmlResponse
-        selenium_response = HtmlResponse(
-            url=response.url,
-            body=html_content,
-            encoding='utf-8'
-        )
-        
-        yield from self.parse_article(selenium_response)
-
+    @timed_stage('article')
     def parse_article(self, response):
-        self.processed_articles += 1
-
         # Check if this is a redirect to main page (common issue with aysor.am)
         if response.url == "https://www.aysor.am/am" or "aysor.am/am" == response.url.rstrip('/'):
             self.logger.warning(f"🔄 Article redirected to main page: {response.url}")
@@ -403,6 +381,16 @@ class AysorSpider(scrapy.Spider):
         # Clean title for display
         display_title = title[:60] + "..." if title and len(title) > 60 else title or "Անանուն հոդված"
         
+        # Too little text over HTTP: retry the article in the browser
+        if not content or len(content.strip()) <= 50:
+            fallback = browser_fallback(self, response)
+            if fallback:
+                yield fallback
+                return
+        else:
+            extraction_succeeded(self, response)
+        self.processed_articles += 1
+
         # Check for keywords in title or content
         title_has_keyword = self.article_contains_keyword(title) if title else False
         content_has_keyword = self.article_contains_keyword(content) if content else False
@@ -412,7 +400,7 @@ class AysorSpider(scrapy.Spider):
             self.logger.info(f"✅ Բանալի բառ գտնվեց ({keyword_source}): {display_title}")
             
             # Mark as processed only after successful keyword match
-            self.mark_article_processed(response.url, title)
+            self.mark_article_processed(response.url, content, requested_url(response))
             self.new_articles += 1
             
             item = NewsScraperItem()
@@ -425,14 +413,19 @@ class AysorSpider(scrapy.Spider):
         else:
             self.logger.info(f"❌ Բանալի բառ չգտնվեց: {display_title}")
             # Mark as processed even if no keyword match to avoid re-checking
-            self.mark_article_processed(response.url, title)
+            self.mark_article_processed(response.url, content, requested_url(response))
 
     def closed(self, reason):
         """Called when spider finishes"""
+        self.dedup.close()
+        save_listing_fingerprints(self, reason)
+        
         # Clean up Selenium driver
         if self.driver:
             try:
-                self.driver.quit()
+                close_lifecycle(self)  # The site's cookies, storage and cache
+                if not checkin_driver(self):
+                    self.driver.quit()
                 self.logger.info("🚗 Selenium driver փակված է")
             except Exception as e:
                 self.logger.warning(f"⚠️ Selenium driver cleanup error: {e}")
@@ -1,8 +1,13 @@
 import scrapy
 from news_scraper.items import NewsScraperItem
+from news_scraper.run_stats import timed_stage
+from news_scraper.deadline import deadline_near
+from news_scraper.dedup import ArticleDedup, requested_url
+from news_scraper.listing_state import listing_unchanged, save_listing_fingerprints
+from news_scraper.browser_pool import checkout_driver, checkin_driver
+from news_scraper.resource_blocking import block_resources
 import sys
 import os
-import hashlib
 import redis
 from datetime import datetime
 from selenium import webdriver
@@ -83,8 +88,12 @@ class CivilNetSpider(scrapy.Spider):
             chrome_options.add_argument('--disable-features=VizDisplayCompositor')
             chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Warm browser from the shared pool; own Chrome only when the pool has none
+            self.driver = checkout_driver(self)
+            if not self.driver:
+                self.driver = webdriver.Chrome(options=chrome_options)
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            block_resources(self)  # Images, fonts, media and ad/analytics domains over CDP
             self.logger.info("🌐 Selenium Chrome driver ստեղծված է")
         except Exception as e:
             self.logger.warning(f"🌐 Selenium չկա: {e}")
@@ -98,6 +107,8 @@ class CivilNetSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"🔴 Redis չկա, կաշխատի առանց cache: {e}")
             self.redis_client = None
+        # Cache checks and marks batched into pipelined round trips
+        self.dedup = ArticleDedup(self.redis_client, 'civilnet')
 
         # API client
         self.api_base_url = os.environ.get('API_BASE_URL', 'https://beackkayq.onrender.com')
@@ -120,6 +131,7 @@ class CivilNetSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"Բանալի բառերը չհաջողվեց բեռնել: {e}")
             self.keywords = []
+        self.dedup.set_keywords(self.keywords)
 
         # Statistics
         self.processed_articles = 0
@@ -175,24 +187,14 @@ class CivilNetSpider(scrapy.Spider):
         return
         yield
 
-    def is_article_processed(self, url, title):
-        """Check if article was already processed using Redis cache"""
-        if not self.redis_client:
-            return False
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_civilnet:{article_hash}"
-        return self.redis_client.exists(cache_key)
+    def is_article_processed(self, url):
+        """Check if article was already processed (Redis or local dedup store)"""
+        return self.dedup.is_processed(url)
 
-    def mark_article_processed(self, url, title):
-        """Mark article as processed in Redis cache"""
-        if not self.redis_client:
-            return
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_civilnet:{article_hash}"
-        # Mark as processed (expire in 7 days)
-        self.redis_client.setex(cache_key, 604800, "1")
+    def mark_article_processed(self, url, content=None, original_url=None):
+        """Mark article as processed (Redis or local dedup store)"""
+        # Buffered; flushed in batches and when the spider closes
+        self.dedup.mark(url, content, original_url)
 
     def article_contains_keyword(self, article_text):
         if not article_text:
@@ -204,6 +206,7 @@ class CivilNetSpider(scrapy.Spider):
                 return True
         return False
 
+    @timed_stage('listing')
     def parse_with_selenium_only(self, url):
         """Parse page using only Selenium without scrapy requests"""
         try:
@@ -257,6 +260,7 @@ class CivilNetSpider(scrapy.Spider):
         # Limit to latest 10 articles only for optimization (running every 10 minutes)
         articles = articles[:10]
 
+        candidates = []
         for article in articles:
             # Extract link and title using civilnet.am structure
             link = (article.css("div.item-content h4.ellipsis a::attr(href)").get() or
@@ -276,17 +280,27 @@ class CivilNetSpider(scrapy.Spider):
                 title_preview = title_preview.strip()
                 if len(title_preview) < 10:  # Skip too short titles
                     continue
-                    
-                full_url = response.urljoin(link)
-                
-                # Check Redis cache first
-                if self.is_article_processed(full_url, title_preview):
-                    self.cached_skips += 1
-                    continue
-                
-                # Parse article directly with Selenium
-                self.parse_article_direct(full_url)
+                candidates.append(response.urljoin(link))
+
+        # Same links as the last completed run: nothing new to look at
+        if listing_unchanged(self, response.url, candidates):
+            return
+        self.dedup.prefetch(candidates)
+
+        for full_url in candidates:
+            # Stop discovering new articles when the run's deadline is near
+            if deadline_near(self):
+                break
+
+            # Check Redis cache first (answered from the prefetch)
+            if self.is_article_processed(full_url):
+                self.cached_skips += 1
+                continue
+            
+            # Parse article directly with Selenium
+            self.parse_article_direct(full_url)
                 
+    @timed_stage('article')
     def parse_article_direct(self, url):
         """Parse individual article using Selenium directly"""
         try:
@@ -360,7 +374,7 @@ class CivilNetSpider(scrapy.Spider):
             if self.article_contains_keyword(title) or self.article_contains_keyword(content):
                 self.logger.info(f"✅ Բանալի բառ գտնվեց: {display_title}")
                 # Mark as processed only after successful keyword match
-                self.mark_article_processed(url, title)
+                self.mark_article_processed(url, content)
                 self.new_articles += 1
                 
                 # Create and yield item directly
@@ -379,11 +393,12 @@ class CivilNetSpider(scrapy.Spider):
             else:
                 self.logger.info(f"❌ Բանալի բառ չգտնվեց: {display_title}")
                 # Mark as processed even if no keyword match to avoid re-checking
-                self.mark_article_processed(url, title)
+                self.mark_article_processed(url, content)
                 
         except Exception as e:
             self.logger.error(f"❌ Article parsing error: {e}")
             
+    @timed_stage('listing')
     def parse(self, response):
         # Extract articles using the civilnet.am structure
         # Try multiple selectors for different page layouts
@@ -400,6 +415,9 @@ class CivilNetSpider(scrapy.Spider):
         # Limit to latest 10 articles only for optimization (running every 10 minutes)
         articles = articles[:10]
 
+        # Collect the candidates first, so the cache is checked for all of
+        # them in one round trip
+        candidates = []
         for article in articles:
             # Extract link and title using civilnet.am structure
             link = (article.css("div.item-content h4.ellipsis a::attr(href)").get() or
@@ -419,23 +437,32 @@ class CivilNetSpider(scrapy.Spider):
                 title_preview = title_preview.strip()
                 if len(title_preview) < 10:  # Skip too short titles
                     continue
-                    
-                full_url = response.urljoin(link)
-                
-                # Check Redis cache first
-                if self.is_article_processed(full_url, title_preview):
-                    self.cached_skips += 1
-                    continue
+                candidates.append((response.urljoin(link), title_preview))
+
+        # Same links as the last completed run: nothing new to look at
+        if listing_unchanged(self, response.url, (url for url, _ in candidates)):
+            return
+        self.dedup.prefetch(url for url, _ in candidates)
+
+        for full_url, title_preview in candidates:
+            # Stop discovering new articles when the run's deadline is near
+            if deadline_near(self):
+                break
+            
+            # Check Redis cache first (answered from the prefetch)
+            if self.is_article_processed(full_url):
+                self.cached_skips += 1
+                continue
+            
+            # Add delay and random headers for individual articles
+            time.sleep(random.uniform(1, 3))
                 
-                # Add delay and random headers for individual articles
-                time.sleep(random.uniform(1, 3))
-                    
-                yield scrapy.Request(
-                    url=full_url,
-                    headers=self.get_random_headers(),
-                    callback=self.parse_article,
-                    dont_filter=True
-                )
+            yield scrapy.Request(
+                url=full_url,
+                headers=self.get_random_headers(),
+                callback=self.parse_article,
+                dont_filter=True
+            )
     
     def parse_news_section(self, response):
         """Alternative parsing method for news section"""
@@ -447,6 +474,7 @@ class CivilNetSpider(scrapy.Spider):
         # Limit to latest 10 articles
         article_links = article_links[:10]
         
+        candidates = []
         for link_element in article_links:
             link = link_element.css("::attr(href)").get()
             title_preview = link_element.css("::text").get()
@@ -455,23 +483,33 @@ class CivilNetSpider(scrapy.Spider):
                 title_preview = title_preview.strip()
                 if len(title_preview) < 10:
                     continue
-                    
-                full_url = response.urljoin(link)
-                
-                if self.is_article_processed(full_url, title_preview):
-                    self.cached_skips += 1
-                    continue
+                candidates.append((response.urljoin(link), title_preview))
+
+        # Same links as the last completed run: nothing new to look at
+        if listing_unchanged(self, response.url, (url for url, _ in candidates)):
+            return
+        self.dedup.prefetch(url for url, _ in candidates)
+
+        for full_url, title_preview in candidates:
+            # Stop discovering new articles when the run's deadline is near
+            if deadline_near(self):
+                break
+            
+            if self.is_article_processed(full_url):
+                self.cached_skips += 1
+                continue
+            
+            # Add delay and random headers for individual articles
+            time.sleep(random.uniform(1, 3))
                 
-                # Add delay and random headers for individual articles
-                time.sleep(random.uniform(1, 3))
-                    
-                yield scrapy.Request(
-                    url=full_url,
-                    headers=self.get_random_headers(),
-                    callback=self.parse_article,
-                    dont_filter=True
-                )
+            yield scrapy.Request(
+                url=full_url,
+                headers=self.get_random_headers(),
+                callback=self.parse_article,
+                dont_filter=True
+            )
 
+    @timed_stage('article')
     def parse_article(self, response):
         self.processed_articles += 1
 
@@ -521,7 +559,7 @@ class CivilNetSpider(scrapy.Spider):
         if self.article_contains_keyword(title) or self.article_contains_keyword(content):
             self.logger.info(f"✅ Բանալի բառ գտնվեց: {display_title}")
             # Mark as processed only after successful keyword match
-            self.mark_article_processed(response.url, title)
+            self.mark_article_processed(response.url, content, requested_url(response))
             self.new_articles += 1
             
             item = NewsScraperItem()
@@ -534,14 +572,18 @@ class CivilNetSpider(scrapy.Spider):
         else:
             self.logger.info(f"❌ Բանալի բառ չգտնվեց: {display_title}")
             # Mark as processed even if no keyword match to avoid re-checking
-            self.mark_article_processed(response.url, title)
+            self.mark_article_processed(response.url, content, requested_url(response))
 
     def closed(self, reason):
         """Called when spider finishes"""
+        self.dedup.close()
+        save_listing_fingerprints(self, reason)
+        
         # Close Selenium driver
         if hasattr(self, 'driver') and self.driver:
             try:
-                self.driver.quit()
+                if not checkin_driver(self):
+                    self.driver.quit()
                 self.logger.info("🌐 Selenium driver-ը փակված է")
             except Exception as e:
                 self.logger.warning(f"🌐 Selenium driver-ը չափակվեց: {e}")
@@ -1,8 +1,17 @@
 import scrapy
 from news_scraper.items import NewsScraperItem
+from news_scraper.run_stats import timed_stage
+from news_scraper.deadline import deadline_near
+from news_scraper.dedup import ArticleDedup
+from news_scraper.listing_state import listing_unchanged, save_listing_fingerprints
+from news_scraper.browser_pool import checkout_driver, checkin_driver
+from news_scraper.page_lifecycle import close_lifecycle
+from news_scraper.resource_blocking import block_resources
+from news_scraper.tab_renderer import TabRenderer
+from news_scraper.dom_snapshot import take_snapshot
+from news_scraper.page_ready import PAGE_LOAD_STRATEGY, load_page, wait_until_ready
 import sys
 import os
-import hashlib
 import redis
 from datetime import datetime
 import random
@@ -31,6 +40,8 @@ class TertSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"🔴 Redis չկա, կաշխատի առանց cache: {e}")
             self.redis_client = None
+        # Cache checks and marks batched into pipelined round trips
+        self.dedup = ArticleDedup(self.redis_client, 'tert')
 
         # API client
         self.api_base_url = os.environ.get('API_BASE_URL', 'https://beackkayq.onrender.com')
@@ -53,6 +64,7 @@ class TertSpider(scrapy.Spider):
         except Exception as e:
             self.logger.warning(f"Բանալի բառերը չհաջողվեց բեռնել: {e}")
             self.keywords = []
+        self.dedup.set_keywords(self.keywords)
 
         # Statistics
         self.processed_articles = 0
@@ -65,10 +77,12 @@ class TertSpider(scrapy.Spider):
         self.driver = None
         self.setup_driver()
 
+    @timed_stage('driver_setup')
     def setup_driver(self):
         """Setup Chrome WebDriver with anti-detection measures"""
         try:
             chrome_options = Options()
+            chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY  # get() returns at DOMContentLoaded
             chrome_options.add_argument('--headless')
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
@@ -84,12 +98,17 @@ class TertSpider(scrapy.Spider):
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
                 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             ]
-            chrome_options.add_argument(f'--user-agent={random.choice(user_agents)}')
+            user_agent = random.choice(user_agents)
+            chrome_options.add_argument(f'--user-agent={user_agent}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
+            # Warm browser from the shared pool; own Chrome only when the pool has none
+            self.driver = checkout_driver(self, user_agent=user_agent)
+            if not self.driver:
+                self.driver = webdriver.Chrome(options=chrome_options)
             
             # Additional anti-detection
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            block_resources(self)  # Images, fonts, media and ad/analytics domains over CDP
             
             self.logger.info("🌐 Chrome WebDriver սկսված է")
             
@@ -97,24 +116,14 @@ class TertSpider(scrapy.Spider):
             self.logger.error(f"❌ WebDriver սկսելու սխալ: {e}")
             self.driver = None
 
-    def is_article_processed(self, url, title):
-        """Check if article was already processed using Redis cache"""
-        if not self.redis_client:
-            return False
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_tert:{article_hash}"
-        return self.redis_client.exists(cache_key)
+    def is_article_processed(self, url):
+        """Check if article was already processed (Redis or local dedup store)"""
+        return self.dedup.is_processed(url)
 
-    def mark_article_processed(self, url, title):
-        """Mark article as processed in Redis cache"""
-        if not self.redis_client:
-            return
-        # Create unique hash for article
-        article_hash = hashlib.md5(f"{url}:{title}".encode()).hexdigest()
-        cache_key = f"processed_tert:{article_hash}"
-        # Mark as processed (expire in 7 days)
-        self.redis_client.setex(cache_key, 604800, "1")
+    def mark_article_processed(self, url, content=None, original_url=None):
+        """Mark article as processed (Redis or local dedup store)"""
+        # Buffered; flushed in batches and when the spider closes
+        self.dedup.mark(url, content, original_url)
 
     def article_contains_keyword(self, article_text):
         if not article_text:
@@ -180,6 +189,7 @@ class TertSpider(scrapy.Spider):
         """This method won't be called - Selenium parsing is done directly"""
         pass
 
+    @timed_stage('listing')
     def selenium_parse(self):
         """Main parsing method using Selenium"""
         if not self.driver:
@@ -189,8 +199,7 @@ class TertSpider(scrapy.Spider):
         try:
             # Navigate to tert.am
             self.logger.info("🔍 TERT.AM բեռնում...")
-            self.driver.get("https://tert.am/am")
-            time.sleep(random.uniform(3, 5))
+            load_page(self, "https://tert.am/am", 'listing')
             
             # Check if page loaded successfully
             try:
@@ -203,7 +212,8 @@ class TertSpider(scrapy.Spider):
             
             # Human-like scrolling
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/3);")
-            time.sleep(2)
+            # Let items lazy-loaded by the scroll arrive (network idle), at most 2 s
+            wait_until_ready(self.driver, timeout=2)
             
             # Find article links
             article_links = []
@@ -223,10 +233,13 @@ class TertSpider(scrapy.Spider):
                     ".post a",
                     "article a"
                 ]
+
+                # Text and attributes of all candidate links in one round trip
+                page = take_snapshot(self.driver, selectors + ['a'])
                 
                 for selector in selectors:
                     try:
-                        links = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                        links = page.find_elements(By.CSS_SELECTOR, selector)
                         if links:
                             article_links = links[:10]  # Limit to 10 articles
                             self.logger.info(f"📰 {len(article_links)} հոդված գտնվեց ({selector})")
@@ -236,7 +249,7 @@ class TertSpider(scrapy.Spider):
                 
                 if not article_links:
                     # Fallback - get all tert.am article links with better filtering
-                    all_links = self.driver.find_elements(By.TAG_NAME, "a")
+                    all_links = page.find_elements(By.TAG_NAME, "a")
                     for link in all_links:
                         try:
                             href = link.get_attribute("href")
@@ -301,30 +314,29 @@ class TertSpider(scrapy.Spider):
                     self.logger.warning(f"⚠️ Հղման տվյալների քաշման սխալ: {e}")
                     continue
             
-            # Process each article with stable data
-            processed_urls = set()
+            # Same links as the last completed run: nothing new to look at
+            if listing_unchanged(self, self.start_urls[0], (article['url'] for article in article_data)):
+                return
+
+            # Skip duplicates and articles already in the cache (one round trip)
+            self.dedup.prefetch(article['url'] for article in article_data)
+            previews = {}
             for article in article_data:
-                try:
-                    if article['url'] in processed_urls:
-                        continue
-                    
-                    processed_urls.add(article['url'])
-                    
-                    # Check cache
-                    if self.is_article_processed(article['url'], article['title']):
-                        self.cached_skips += 1
-                        continue
-                    
-                    # Process article
-                    self.process_article_with_selenium(article['url'], article['title'])
-                    
-                    # Delay between articles
-                    time.sleep(random.uniform(2, 4))
-                    
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Հղման մշակման սխալ: {e}")
+                if article['url'] in previews:
                     continue
+                if self.is_article_processed(article['url']):
+                    self.cached_skips += 1
+                    continue
+                previews[article['url']] = article['title']
 
+            # Load several articles at once in tabs, extract each as it finishes
+            renderer = TabRenderer(self)
+            for url in renderer.render(previews):
+                # Stop discovering new articles when the run's deadline is near
+                if deadline_near(self):
+                    break
+                try:
+                    self.process_article_with_selenium(url, previews[url])
                 except Exception as e:
                     self.logger.warning(f"⚠️ Հղման մշակման սխալ: {e}")
                     continue
@@ -333,15 +345,10 @@ class TertSpider(scrapy.Spider):
             self.logger.error(f"❌ Parsing սխալ: {e}")
             self.blocked_attempts += 1
 
+    @timed_stage('article')
     def process_article_with_selenium(self, url, preview_title):
-        """Process individual article using Selenium"""
+        """Process an article already loaded in the driver's current tab"""
         try:
-            self.logger.info(f"🔍 Բեռնում: {url}")
-            
-            # Navigate to article
-            self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
-            
             # Wait for content to load
             try:
                 WebDriverWait(self.driver, 10).until(
@@ -353,36 +360,56 @@ class TertSpider(scrapy.Spider):
             
             self.processed_articles += 1
 
+            title_selectors = [
+                "article h1",
+                "main h1",
+                "div.content h1",
+                "div.article h1",
+                "div.post h1",
+                "h1.title",
+                "h1.article-title",
+                "h1.entry-title",
+                "h1.post-title",
+                "h1.news-title",
+                "h1",
+                "title",
+                "meta[property='og:title']"
+            ]
+            content_selectors = [
+                "div.post-content p",
+                "div.entry-content p",
+                "div.article-content p",
+                "div.post-body p",
+                "div.news-content p",
+                "div.post-text p",
+                "div.article-text p",
+                "div.news-text p",
+                "div.text p",
+                "main p",
+                "article p",
+                ".post-content p",
+                ".entry-content p",
+                ".article-content p"
+            ]
+
+            # Read every element the extraction below needs in one round trip
+            page = take_snapshot(self.driver, title_selectors + content_selectors + ['p'])
+
             # Extract title with better selectors for tert.am
             title = None
             try:
-                title_selectors = [
-                    "article h1",
-                    "main h1",
-                    "div.content h1",
-                    "div.article h1",
-                    "div.post h1",
-                    "h1.title",
-                    "h1.article-title",
-                    "h1.entry-title",
-                    "h1.post-title",
-                    "h1.news-title",
-                    "h1",
-                    "title",
-                    "meta[property='og:title']"
-                ]
                 for selector in title_selectors:
                     try:
                         if selector == "title":
-                            title_element = self.driver.find_element(By.TAG_NAME, "title")
+                            title_element = page.find_element(By.TAG_NAME, "title")
                         elif selector == "meta[property='og:title']":
-                            title_element = self.driver.find_element(By.CSS_SELECTOR, selector)
+                            title_element = page.find_element(By.CSS_SELECTOR, selector)
                             title = title_element.get_attribute("content")
                             if title and title.strip():
                                 break
                             continue
                         else:
-                            title_element = self.driver.find_element(By.CSS_SELECTOR, selector)
+                            title_element = page.find_element(By.CSS_SELECTOR, selector)
                         
                         if title_element.text.strip():
                             title = title_element.text.strip()
@@ -415,26 +442,9 @@ class TertSpider(scrapy.Spider):
             # Extract content with advanced filtering for tert.am
             content_parts = []
             try:
-                content_selectors = [
-                    "div.post-content p",
-                    "div.entry-content p",
-                    "div.article-content p",
-                    "div.post-body p",
-                    "div.news-content p",
-                    "div.post-text p",
-                    "div.article-text p",
-                    "div.news-text p",
-                    "div.text p",
-                    "main p",
-                    "article p",
-                    ".post-content p",
-                    ".entry-content p",
-                    ".article-content p"
-                ]
-                
                 for selector in content_selectors:
                     try:
-                        paragraphs = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                        paragraphs = page.find_elements(By.CSS_SELECTOR, selector)
                         if paragraphs:
                             content_parts = [p.text.strip() for p in paragraphs if p.text.strip()]
                             break
@@ -443,7 +453,7 @@ class TertSpider(scrapy.Spider):
                 
                 # Fallback to all paragraphs
                 if not content_parts:
-                    paragraphs = self.driver.find_elements(By.TAG_NAME, "p")
+                    paragraphs = page.find_elements(By.TAG_NAME, "p")
                     content_parts = [p.text.strip() for p in paragraphs if p.text.strip()]
                 
             except Exception as e:
@@ -514,7 +524,7 @@ class TertSpider(scrapy.Spider):
                 
                 if self.article_contains_keyword(full_text):
                     self.logger.info(f"✅ Բանալի բառ գտնվեց: {display_title}")
-                    self.mark_article_processed(url, title)
+                    self.mark_article_processed(url, content)
                     self.new_articles += 1
                     
                     # Create item and process through pipeline
@@ -530,11 +540,11 @@ class TertSpider(scrapy.Spider):
                     
                 else:
                     self.logger.info(f"❌ Բանալի բառ չգտնվեց: {display_title}")
-                    self.mark_article_processed(url, title)
+                    self.mark_article_processed(url, content)
             else:
                 self.logger.info(f"⚠️ Անբավարար պարունակություն: {display_title}")
                 self.logger.info(f"⚠️ Պարունակության երկարություն: {len(content.strip()) if content else 0} նիշ")
-                self.mark_article_processed(url, title)
+                self.mark_article_processed(url, content)
                 
         except Exception as e:
             self.logger.error(f"❌ Հոդվածի մշակման սխալ: {e}")
@@ -545,24 +555,17 @@ class TertSpider(scrapy.Spider):
 
     def closed(self, reason):
         """Called when spider finishes"""
-        # Close Selenium WebDriver and aggressive memory cleanup
+        self.dedup.close()
+        save_listing_fingerprints(self, reason)
+        
+        # Close Selenium WebDriver; the site's browser context takes its
+        # cookies, storage and cache with it
         if self.driver:
             try:
-                # Clear browser cache and cookies
-                self.driver.delete_all_cookies()
-                self.driver.execute_script("window.localStorage.clear();")
-                self.driver.execute_script("window.sessionStorage.clear();")
-                
-                # Clear all browser data
-                self.driver.execute_script("window.indexedDB.deleteDatabase('*');")
-                self.driver.execute_script("window.caches.keys().then(function(names) { for (let name of names) caches.delete(name); });")
-                
-                # Force garbage collection in browser
-                self.driver.execute_script("if (window.gc) { window.gc(); }")
-                
-                # Quit driver
-                self.driver.quit()
-                self.logger.info("🔒 WebDriver փակվեց և aggressive memory cleanup արվեց")
+                close_lifecycle(self)
+                if not checkin_driver(self):
+                    self.driver.quit()
+                self.logger.info("🔒 WebDriver փակվեց և browser context-ը մաքրվեց")
             except Exception as e:
                 self.logger.warning(f"⚠️ WebDriver cleanup error: {e}")
             
@@ -0,0 +1,122 @@
+# Concurrent page rendering in tabs of one Chrome
+#
+# Selenium drives one tab at a time, but navigation itself is asynchronous:
+# TabRenderer starts loads in several tabs of the spider's browser with
+# `location.href = url`, polls them, and yields each URL as soon as its tab
+# has finished loading, with the driver switched to that tab. The caller
+# extracts from the live DOM exactly as after `driver.get()`, while the other
+# tabs keep loading, so network waits overlap instead of adding up.
+#
+# RENDER_TABS caps the open tabs, RENDER_TABS_PER_DOMAIN the loads in flight
+# per domain. A tab counts as loaded by the same readiness check as
+# page_ready.wait_until_ready(), and new loads on a domain are spaced by the
+# spider's DomainPoliteness delay. Tabs are page_lifecycle targets in the
+# site's browser context: each one is closed once its page has been
+# extracted and a fresh one takes its place.
+
+import time
+from collections import Counter, deque
+from urllib.parse import urlparse
+
+from news_scraper.page_ready import get_politeness, is_ready, ready_selector, start_navigation
+from news_scraper.page_lifecycle import get_lifecycle
+from news_scraper.resource_blocking import report_savings
+
+DEFAULT_TABS = 3
+DEFAULT_TABS_PER_DOMAIN = 2
+DEFAULT_PAGE_TIMEOUT = 20
+POLL_INTERVAL_SECONDS = 0.1
+
+
+def _setting(spider, name, default):
+    settings = getattr(spider, 'settings', None)
+    if settings is None:
+        return default
+    return settings.getint(name, default)
+
+
+class TabRenderer:
+    """Load several URLs at once in tabs of spider.driver"""
+
+    def __init__(self, spider, page_type='article', tabs=None, per_domain=None, page_timeout=DEFAULT_PAGE_TIMEOUT):
+        self.spider = spider
+        self.driver = spider.driver
+        self.selector = ready_selector(spider.name, page_type)
+        self.politeness = get_politeness(spider)
+        self.tabs = max(1, tabs or _setting(spider, 'RENDER_TABS', DEFAULT_TABS))
+        self.per_domain = max(1, per_domain or _setting(spider, 'RENDER_TABS_PER_DOMAIN', DEFAULT_TABS_PER_DOMAIN))
+        self.page_timeout = page_timeout
+        self.lifecycle = get_lifecycle(spider)
+
+    def _start(self, handle, url):
+        self.politeness.record(url)
+        self.driver.switch_to.window(handle)
+        start_navigation(self.driver, url)
+        # Keep the browser pool's max-pages accounting right
+        browser = getattr(self.spider, 'pooled_browser', None)
+        if browser is not None:
+            browser.pages += 1
+
+    def _loaded(self, handle):
+        self.driver.switch_to.window(handle)
+        return is_ready(self.driver, self.selector)
+
+    def _finished(self, loading, now):
+        """A tab whose page is ready (or timed out), or None"""
+        for handle, (url, started) in loading.items():
+            if self._loaded(handle):
+                return handle
+            if now - started >= self.page_timeout:
+                self.spider.logger.warning(f"⏰ Timeout: {url}")
+                try:
+                    self.driver.execute_script("window.stop();")
+                except Exception:
+                    pass
+                return handle
+        return None
+
+    def render(self, urls):
+        """Yield each URL once its tab has loaded, with the driver on that tab"""
+        pending = deque(dict.fromkeys(urls))
+        if not pending:
+            return
+
+        free = [self.lifecycle.open_page() for _ in range(min(self.tabs, len(pending)))]
+        loading = {}
+        in_flight = Counter()
+        try:
+            while pending or loading:
+                # Start loads in free tabs, skipping domains at their cap or
+                # still inside their politeness delay
+                for url in list(pending):
+                    if not free:
+                        break
+                    domain = urlparse(url).netloc
+                    if in_flight[domain] >= self.per_domain or self.politeness.delay_left(url) > 0:
+                        continue
+                    pending.remove(url)
+                    handle = free.pop()
+                    self.spider.logger.info(f"🔍 Բեռնում: {url}")
+                    self._start(handle, url)
+                    loading[handle] = (url, time.time())
+                    in_flight[domain] += 1
+
+                handle = self._finished(loading, time.time())
+                if handle is None:
+                    time.sleep(POLL_INTERVAL_SECONDS)
+                    continue
+
+                url, _ = loading.pop(handle)
+                in_flight[urlparse(url).netloc] -= 1
+                self.driver.switch_to.window(handle)
+                report_savings(self.spider, url)
+                try:
+                    yield url
+                finally:
+                    # Done with this page: its target goes, a fresh one replaces it
+                    self.lifecycle.close_page(handle)
+                if pending:
+                    free.append(self.lifecycle.open_page())
+        finally:
+            for handle in [*free, *loading]:
+                self.lifecycle.close_page(handle)
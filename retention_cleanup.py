@@ -0,0 +1,64 @@
+# Background retention cleanup for the monitor
+# Deletes old articles through the API on its own schedule, so cleanup never delays crawling.
+
+import threading
+
+
+class RetentionCleanupScheduler:
+    """Run NewsMonitorAPI.cleanup_old_articles on a background thread
+
+    The first run starts right away, successful runs repeat every
+    `interval` seconds. A failed run is retried after `retry_delay`
+    seconds, doubling on every further failure up to `interval`.
+    """
+
+    def __init__(self, api_client, days_to_keep, interval, retry_delay=60):
+        self.api_client = api_client
+        self.days_to_keep = days_to_keep
+        self.interval = interval
+        self.retry_delay = min(retry_delay, interval)
+        self.failures = 0
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def next_delay(self):
+        """Seconds until the next run, given the current failure streak"""
+        if self.failures == 0:
+            return self.interval
+        return min(self.retry_delay * 2 ** (self.failures - 1), self.interval)
+
+    def run_once(self):
+        """One cleanup run; returns the number of deleted articles or None"""
+        try:
+            deleted_count = self.api_client.cleanup_old_articles(self.days_to_keep)
+        except Exception as e:
+            print(f"❌ Retention cleanup սխալ: {e}")
+            deleted_count = None
+
+        if deleted_count is None:
+            self.failures += 1
+            print(f"⚠️ Retention cleanup չհաջողվեց ({self.failures} անգամ), "
+                  f"կրկին՝ {self.next_delay() / 60:.1f} րոպեից")
+        else:
+            self.failures = 0
+            if deleted_count > 0:
+                print(f"🗑️ ԽՈՒՄԲ 1 - API-ի միջոցով մաքրվել է {deleted_count} հին հոդված")
+        return deleted_count
+
+    def _run(self):
+        delay = 0
+        while not self.stop_event.wait(delay):
+            self.run_once()
+            delay = self.next_delay()
+
+    def start(self):
+        """Start the background thread (no-op if already running)"""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name='retention-cleanup', daemon=True)
+        self.thread.start()
+        print(f"🧹 Retention cleanup ամեն {self.interval / 60:.0f} րոպե (ֆոնային)")
+
+    def stop(self):
+        """Stop the schedule; a run in progress finishes on its own"""
+        self.stop_event.set()
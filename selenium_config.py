@@ -2,6 +2,7 @@
 # This file contains Selenium setup optimized for Render.com environment
 
 import os
+import sys
 import time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -9,6 +10,9 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'news_scraper_group1'))
+from news_scraper.resource_blocking import ResourceBlocker
+
 def get_selenium_driver():
     """
     Create Selenium WebDriver optimized for Render.com
@@ -24,11 +28,8 @@ def get_selenium_driver():
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
         
         # Aggressive memory optimization
-        chrome_options.add_argument("--disable-images")
-        chrome_options.add_argument("--disable-css")
         chrome_options.add_argument("--disable-extensions")
         chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-javascript")
         chrome_options.add_argument("--disable-background-timer-throttling")
         chrome_options.add_argument("--disable-backgrounding-occluded-windows")
         chrome_options.add_argument("--disable-renderer-backgrounding")
@@ -78,6 +79,9 @@ def get_selenium_driver():
         driver.set_page_load_timeout(30)
         driver.implicitly_wait(10)
         
+        # Chrome has no switches for images/CSS; block them over CDP instead
+        ResourceBlocker().enable(driver)
+        
         return driver
         
     except Exception as e:
@@ -0,0 +1,97 @@
+# Per-spider time budgets for the monitor
+# Learns how long each site usually takes and gives it a deadline to match.
+
+import os
+import json
+
+
+class SpiderTimeBudgets:
+    """Keep a time budget per spider, driven by an EWMA of its run durations
+
+    The budget is the EWMA duration times `headroom`, clamped to
+    [min_budget, max_budget]. A run that stopped early at its deadline only
+    shows a lower bound of the time the site needed, so instead of being
+    averaged in it grows the budget by `growth`. The learned state is
+    saved to a JSON file so restarts keep it.
+    """
+
+    def __init__(self, spiders, state_file, default_budget, min_budget, max_budget, headroom=1.5, alpha=0.3,
+                 growth=1.25, initial_budgets=None):
+        self.state_file = state_file
+        self.min_budget = min_budget
+        self.max_budget = max(min_budget, max_budget)
+        self.default_budget = self.clamp(default_budget)
+        self.headroom = headroom
+        self.alpha = alpha
+        self.growth = growth
+        self.state = self.load_state()
+
+        # New spiders start at their manifest timeout if known; removed spiders are forgotten
+        initial_budgets = initial_budgets or {}
+        for spider_name in spiders:
+            self.state.setdefault(spider_name, {
+                'duration': None,
+                'budget': self.clamp(initial_budgets.get(spider_name, self.default_budget)),
+                'deadline_hits': 0
+            })
+        for spider_name in list(self.state):
+            if spider_name not in spiders:
+                del self.state[spider_name]
+
+    def clamp(self, budget):
+        """Keep a budget within the configured bounds"""
+        return min(max(budget, self.min_budget), self.max_budget)
+
+    def load_state(self):
+        """Load learned per-spider durations from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state, dict):
+                print(f"⏳ Budget state բեռնվեց՝ {self.state_file}")
+                return state
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Budget state կարդալու սխալ: {e}")
+        return {}
+
+    def save_state(self):
+        """Persist learned per-spider durations (atomic replace)"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"⚠️ Budget state պահպանելու սխալ: {e}")
+
+    def budget(self, spider_name):
+        """Seconds the spider may run this cycle"""
+        entry = self.state.get(spider_name)
+        return entry['budget'] if entry else self.default_budget
+
+    def record_run(self, spider_name, duration_seconds=None, deadline_hit=False):
+        """Fold a finished run into the spider's duration estimate
+
+        Pass duration_seconds=None when the run produced no summary; the
+        budget is left unchanged.
+        """
+        entry = self.state.get(spider_name)
+        if entry is None or duration_seconds is None:
+            return self.budget(spider_name)
+
+        if deadline_hit:
+            entry['deadline_hits'] += 1
+            entry['duration'] = max(entry['duration'] or 0, duration_seconds)
+            entry['budget'] = self.clamp(entry['budget'] * self.growth)
+        else:
+            if entry['duration'] is None:
+                entry['duration'] = duration_seconds
+            else:
+                entry['duration'] = self.alpha * duration_seconds + (1 - self.alpha) * entry['duration']
+            entry['budget'] = self.clamp(entry['duration'] * self.headroom)
+
+        self.save_state()
+        return entry['budget']
@@ -0,0 +1,105 @@
+# Per-site adaptive polling scheduler for the monitor
+# Learns how often each site publishes and polls busy sites more often than quiet ones.
+
+import os
+import json
+import time
+
+
+class AdaptiveSpiderScheduler:
+    """Keep a next-run time per spider, driven by an EWMA of its new-article rate
+
+    After each run the share of new articles among all checked links,
+    new_articles / (new_articles + cached_skips), is folded into an EWMA.
+    A churn of 1.0 polls at min_interval, a churn of 0.0 at max_interval.
+    The learned state is saved to a JSON file so restarts keep it.
+    """
+
+    def __init__(self, spiders, state_file, initial_interval, min_interval, max_interval, alpha=0.3,
+                 initial_intervals=None):
+        self.state_file = state_file
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.initial_interval = self.clamp(initial_interval)
+        self.alpha = alpha
+        self.state = self.load_state()
+
+        # New spiders start due immediately, at their manifest cadence if known;
+        # removed spiders are forgotten
+        initial_intervals = initial_intervals or {}
+        now = time.time()
+        for spider_name in spiders:
+            self.state.setdefault(spider_name, {
+                'churn': None,
+                'interval': self.clamp(initial_intervals.get(spider_name, self.initial_interval)),
+                'next_run': now,
+                'last_run': None
+            })
+        for spider_name in list(self.state):
+            if spider_name not in spiders:
+                del self.state[spider_name]
+
+    def clamp(self, interval):
+        """Keep an interval within the configured bounds"""
+        return min(max(interval, self.min_interval), self.max_interval)
+
+    def load_state(self):
+        """Load learned per-spider state from disk"""
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if isinstance(state, dict):
+                print(f"📅 Scheduler state բեռնվեց՝ {self.state_file}")
+                return state
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️ Scheduler state կարդալու սխալ: {e}")
+        return {}
+
+    def save_state(self):
+        """Persist learned per-spider state (atomic replace)"""
+        try:
+            os.makedirs(os.path.dirname(self.state_file) or '.', exist_ok=True)
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            print(f"⚠️ Scheduler state պահպանելու սխալ: {e}")
+
+    def due_spiders(self, now=None):
+        """Spiders whose next-run time has passed, most overdue first"""
+        now = now or time.time()
+        due = [name for name, entry in self.state.items() if entry['next_run'] <= now]
+        return sorted(due, key=lambda name: self.state[name]['next_run'])
+
+    def seconds_until_next(self, now=None):
+        """Seconds until the earliest scheduled spider is due"""
+        now = now or time.time()
+        if not self.state:
+            return self.initial_interval
+        next_run = min(entry['next_run'] for entry in self.state.values())
+        return max(0, next_run - now)
+
+    def record_result(self, spider_name, new_articles=None, cached_skips=None, now=None):
+        """Update the spider's churn estimate and schedule its next run
+
+        Pass None counts for a failed run: the spider is retried at its
+        current interval without touching the learned rate.
+        """
+        now = now or time.time()
+        entry = self.state[spider_name]
+
+        if new_articles is not None and cached_skips is not None and new_articles + cached_skips > 0:
+            sample = new_articles / (new_articles + cached_skips)
+            if entry['churn'] is None:
+                entry['churn'] = sample
+            else:
+                entry['churn'] = self.alpha * sample + (1 - self.alpha) * entry['churn']
+            entry['interval'] = self.max_interval - (self.max_interval - self.min_interval) * entry['churn']
+
+        entry['last_run'] = now
+        entry['next_run'] = now + entry['interval']
+        self.save_state()
+        return entry['interval']